@@ -1,119 +1,568 @@
 from agno.agent import Agent
 from agno.models.google import Gemini
 from tools import (
-    FinancialDataTool, 
+    _FINANCIAL_DATA_TOOL, 
     WebResearchTool, 
     CompetitiveAnalysisTool, 
     ChartGenerationTool, 
     ReportGenerationTool
 )
 from config import Config
-from typing import Dict, Any
+from llm_cache import cached
+from task_store import task_store
+from typing import Dict, Any, AsyncIterator, Callable, Iterator, List, Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+import asyncio
+import hashlib
+import json
 import logging
+import re
+import secrets
+import string
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+# Tool instances shared by every agent so their state is not duplicated per agent;
+# the financial tool is the one tools.py already shares with its module-level helpers
+_WEB_TOOL = WebResearchTool()
+_COMPETITIVE_TOOL = CompetitiveAnalysisTool()
+_CHART_TOOL = ChartGenerationTool()
+_REPORT_TOOL = ReportGenerationTool()
+# Runs tool fetches that are needed alongside another fetch while building a prompt
+_PREFETCH_POOL = ThreadPoolExecutor(max_workers=Config.AGENT_MAX_CONCURRENCY, thread_name_prefix="tool-prefetch")
+# Runs deferred report jobs off the request worker
+_REPORT_POOL = ThreadPoolExecutor(max_workers=Config.AGENT_MAX_CONCURRENCY, thread_name_prefix="report-job")
 
-class FinancialAnalysisAgent:
+
+FINANCIAL_INSTRUCTIONS = (
+    "ROLE: CFA-level senior equity analyst.",
+    "DATA: Use pre-fetched tool data when given, else call get_stock_data() before any analysis; use tool values exactly. Never use placeholders ($1, $X, $XXX); write 'Not Available' for N/A or None.",
+    "ANALYZE: ratios (P/E, PEG, ROE, ROA, D/E, current/quick), valuation vs history and peers, balance sheet and cash flow, growth and margins, liquidity/solvency/operational risks, RSI/MA/MACD context.",
+    "OUTPUT: Open with the actual current price and a BUY/HOLD/SELL thesis with a numeric 12-month price target; compare to industry and peers; 2-3 drivers and 2-3 risks; headers and bullets; institutional tone.",
+    "CHECK: price, target and every metric are real tool numbers.",
+)
+
+
+RESEARCH_INSTRUCTIONS = (
+    "ROLE: Senior market research analyst.",
+    "METHOD: Prefer credible sources (Reuters, Bloomberg, WSJ, FT, press releases) from the last 30 days with dates; separate material from routine news; tag sentiment POSITIVE/NEUTRAL/NEGATIVE with evidence; assess short- and long-term impact.",
+    "COVER: earnings and guidance, M&A/partnerships/products, regulatory and legal, industry trends, macro factors.",
+    "OUTPUT: 1. Executive summary (2-3 sentences) 2. Key developments with dates and sources 3. Sentiment 4. Catalysts and risks 5. Monitoring points.",
+    "Attribute sources, separate fact from opinion, stay balanced. Return a single plain text response, not an object.",
+)
+
+
+COMPETITIVE_INSTRUCTIONS = (
+    "ROLE: Senior strategy analyst.",
+    "FRAMEWORK: Porter's Five Forces (rivalry, supplier power, buyer power, substitutes, entry barriers).",
+    "METHOD: Pick 3-5 relevant peers; benchmark margins, growth, ROE, leverage and multiples; assess market share, geography, portfolio, moats and 3-year trends.",
+    "OUTPUT: 1. Positioning summary 2. Peer comparison table 3. Competitive advantages 4. Threats 5. Strategic recommendations - data-backed and actionable.",
+)
+
+
+TECHNICAL_INSTRUCTIONS = (
+    "ROLE: Chartered Market Technician (CMT).",
+    "METHOD: Multi-timeframe trends; RSI (<30 oversold, >70 overbought, divergences); MACD crosses and divergences; 20/50/200-day SMAs incl. golden/death cross; volume and accumulation/distribution; support/resistance from pivots.",
+    "RISK: Give signal confidence (High/Medium/Low), risk/reward, stop losses and position sizing.",
+    "OUTPUT: 1. Outlook BULLISH/NEUTRAL/BEARISH with confidence 2. Indicator readings 3. Support/resistance levels 4. Volume 5. Entries, stops and targets for short (1-4w), medium (1-6m) and long (6m+) horizons.",
+)
+
+
+REPORT_INSTRUCTIONS = (
+    "ROLE: Managing Director of Equity Research writing institutional-grade reports.",
+    "DATA: Use actual numbers from the provided analysis; never use placeholders ($1, $X, $XXX); write 'Price data unavailable' when no price is given.",
+    "INTEGRATE: financial metrics and margins, news impact, competitive dynamics, technical timing.",
+    "STRUCTURE: **EXECUTIVE SUMMARY** (BUY/HOLD/SELL, 12-month target, 3-point thesis, key risks and catalysts); **INVESTMENT HIGHLIGHTS** (3-5 quantified drivers); **VALUATION ANALYSIS** (DCF, multiples, peer premium/discount, sensitivity); **RISK FACTORS** (3-5 with High/Medium/Low probability and price impact); **INVESTMENT TIMELINE** (0-6m, 6-18m, 18m+).",
+    "Objective, precise, actionable; clear headers.",
+)
+
+
+# Prompt templates are parsed once at import; callers only substitute values
+_FINANCIAL_ANALYSIS_TPL = string.Template("""
+You are a senior financial analyst. Perform a comprehensive financial analysis of $symbol.
+
+CRITICAL DATA INJECTION: I am providing you with REAL data that you MUST use exactly as provided:
+- CURRENT STOCK PRICE: $$${current_price}
+- MARKET CAP: $market_cap
+- P/E RATIO: $pe_ratio
+
+PRE-FETCHED TOOL DATA (JSON):
+get_stock_data("$symbol"): $stock_data
+calculate_technical_indicators("$symbol"): $indicators
+
+ABSOLUTE REQUIREMENTS:
+1. Base the analysis on the pre-fetched tool data above
+2. Call tools only for figures the pre-fetched data lacks
+3. Use the REAL DATA I provided above - DO NOT use $$1, $$X, or any placeholders
+4. Your response MUST start with: "Current Stock Price: $$${current_price}"
+5. Calculate a realistic price target based on the current price of $$${current_price}
+
+MANDATORY FORMAT:
+Current Stock Price: $$${current_price}
+12-Month Price Target: $$[Calculate realistic target based on $$${current_price}]
+Market Capitalization: $market_cap
+P/E Ratio: $pe_ratio
+Recommendation: [BUY/HOLD/SELL]
+
+[Then provide detailed analysis using the real data]
+
+VERIFICATION: Every financial figure in your response must be real - no $$1 values allowed.
+""")
+
+_COMPARE_STOCKS_TPL = string.Template("""
+You are a senior financial analyst. Compare the following stocks: $symbols_str
+
+$real_data_text
+
+CRITICAL INSTRUCTION: Use the REAL DATA provided above. Never use placeholder values like $$1, $$X, or $$XXX.
+
+MANDATORY STEPS:
+1. For EACH stock ($symbols_str), call get_stock_data() to get additional financial metrics
+2. For EACH stock, call calculate_technical_indicators() for technical data
+3. Use the REAL PRICES I provided above in your comparison table
+
+Create a comparison table with the REAL data including:
+- Current stock prices (use the exact values from the real data above)
+- Market capitalizations (use the exact values from the real data above)
+- P/E ratios (use the exact values from the real data above)
+- Technical indicators and investment rankings
+
+VERIFICATION: Every price in your comparison must match the real data provided above.
+""")
+
+_FINANCIAL_BATCH_TPL = string.Template("""
+You are a senior financial analyst. Perform a financial analysis of each stock below.
+
+$batch_header
+
+$real_data_text
+
+For each stock, start its section with "Current Stock Price: $$[real price]", then give a
+12-month price target, market capitalization, P/E ratio and a BUY/HOLD/SELL recommendation
+followed by a concise analysis. Use the REAL DATA above - never use $$1, $$X, or placeholders.
+""")
+
+_COMPANY_NEWS_TPL = string.Template("""
+Research recent news and developments about $company.
+
+Pre-fetched news articles (JSON):
+$news
+
+Find and analyze:
+1. Recent news articles (last 30 days)
+2. Major announcements or events
+3. Market sentiment analysis
+4. Industry trends affecting the company
+5. Overall news impact on stock performance
+
+Base the analysis on the articles above; use web search tools only to fill gaps.
+Return your analysis as a single text response.
+""")
+
+_MARKET_SENTIMENT_TPL = string.Template("""
+Analyze current market sentiment regarding $topic.
+
+Research:
+1. Recent market discussions and news
+2. Analyst opinions and reports
+3. Social media and forum sentiment
+4. Overall market mood and trends
+5. Potential impact on related stocks
+
+Use search tools to gather diverse perspectives.
+Return your analysis as a single coherent text response.
+""")
+
+_COMPETITIVE_LANDSCAPE_TPL = string.Template("""
+Analyze the competitive landscape for $company.
+
+Perform:
+1. Identify main competitors in the same sector
+2. Compare financial performance vs competitors
+3. Analyze competitive advantages and weaknesses
+4. Market share and positioning analysis
+5. Competitive threats and opportunities
+
+Use competitive analysis tools to gather comparison data.
+""")
+
+_SECTOR_LEADERS_TPL = string.Template("""
+Compare the leading companies in the $sector sector.
+
+Analyze:
+1. Top companies by market cap and performance
+2. Financial metrics comparison
+3. Competitive positioning
+4. Growth prospects and strategies
+5. Investment attractiveness ranking
+
+Use tools to get real financial data for comparison.
+""")
+
+_SECTOR_LEADERS_BATCH_TPL = string.Template("""
+Compare the leading companies in each of the sectors below.
+
+$batch_header
+
+For each sector analyze the top companies by market cap and performance, a financial
+metrics comparison, competitive positioning, growth prospects and an investment
+attractiveness ranking. Use tools to get real financial data for comparison.
+""")
+
+_TECHNICAL_ANALYSIS_TPL = string.Template("""
+Perform detailed technical analysis for $symbol.
+
+Pre-fetched technical indicators (JSON):
+$indicators
+
+Analyze:
+1. Current technical indicators (RSI, MACD, Moving Averages)
+2. Price trends and momentum
+3. Support and resistance levels
+4. Trading volume analysis
+5. Short-term and medium-term outlook
+6. Entry/exit points for traders
+
+Base the analysis on the indicators above; use tools only for charts or data they lack.
+""")
+
+_CHART_ANALYSIS_TPL = string.Template("""
+Generate and analyze charts for: $symbols_str
+
+Create:
+1. Individual price charts with technical indicators
+2. Comparative performance chart
+3. Technical pattern identification
+4. Trend analysis and projections
+5. Trading recommendations based on charts
+
+Use chart generation tools to create visualizations.
+""")
+
+_CHART_ANALYSIS_BATCH_TPL = string.Template("""
+Perform technical chart analysis for each stock below.
+
+$batch_header
+
+For each stock cover current technical indicators (RSI, MACD, Moving Averages),
+technical patterns, support and resistance levels, trend projections and trading
+recommendations. Use technical analysis tools to get real data.
+""")
+
+_INVESTMENT_REPORT_TPL = string.Template("""
+You are a Managing Director of Equity Research. Generate a comprehensive investment report for $symbol.
+
+CRITICAL REAL DATA TO USE:
+- CURRENT STOCK PRICE: $$${price}
+- MARKET CAPITALIZATION: $$${market_cap}
+- CALCULATED PRICE TARGET: $$${price_target}
+
+Analysis Data Provided:
+$analysis_data
+
+ABSOLUTE REQUIREMENTS:
+1. Use the REAL DATA provided above - never use $$1, $$X, or placeholders
+2. Start your report with the exact format below using real numbers
+3. Calculate recommendations based on the real current price of $$${real_price}
+
+MANDATORY REPORT FORMAT:
+**INVESTMENT REPORT: $symbol**
+
+**Current Price**: $$${price}
+**12-Month Price Target**: $$${price_target}
+**Market Capitalization**: $$${market_cap}
+**Recommendation**: [BUY/HOLD/SELL based on analysis]
+
+[Then provide detailed rationale using the real financial data]
+
+CRITICAL: Every financial number must be real - absolutely no $$1 values allowed.
+""")
+
+_MARKET_SUMMARY_TPL = string.Template("""
+Create a comprehensive market summary report using the provided data.
+
+Include:
+1. Market Overview and key themes
+2. Sector Performance Analysis
+3. Notable Company Highlights
+4. Technical Market Conditions
+5. News and Sentiment Summary
+6. Investment Opportunities and Risks
+
+Market Data:
+$market_data
+
+Present as a professional market briefing.
+Return your report as a single coherent text response.
+""")
+
+# Part of every LLM cache key, so editing an instruction list or prompt template
+# retires the answers cached under the old wording
+_PROMPT_DIGEST = hashlib.sha256(json.dumps(sorted(
+    (name, value.template if isinstance(value, string.Template) else value)
+    for name, value in globals().items()
+    if isinstance(value, string.Template) or name.endswith("_INSTRUCTIONS")
+)).encode()).hexdigest()[:16]
+
+
+def _batch_prompt_header(labels: List[str]) -> str:
+    """Instructions asking the model to emit one labelled section per item"""
+    return (
+        "For each of the following items, produce a separate section that starts with "
+        "the marker <SYM>ITEM</SYM> on its own line (for example <SYM>" + labels[0] + "</SYM>), "
+        "in the same order, with no text before the first marker: " + ", ".join(labels)
+    )
+
+
+# Labels are tickers or sector names, so match any marker text rather than only [A-Z.]
+_SECTION_RE = re.compile(r"<SYM>(?P<label>.+?)</SYM>(?P<body>.*?)(?=<SYM>|\Z)", re.DOTALL)
+
+
+# Figures the report prompt pulls back out of the financial analysis text
+_PRICE_RE = re.compile(r'Current Stock Price[:\s]*\$?([\d,]+\.?\d*)', re.IGNORECASE)
+_MARKET_CAP_RE = re.compile(r'Market Cap[italization]*[:\s]*\$?([\d,]+\.?\d*[KMB]?)', re.IGNORECASE)
+
+
+def _split_sections(response: str) -> Dict[str, str]:
+    """Split a batched response into {label: section} using the <SYM> markers"""
+    return {m["label"].strip(): m["body"].strip() for m in _SECTION_RE.finditer(response)}
+
+
+def _truncate(data: Any, max_len: int = 2000) -> Any:
+    """Recursively cap long string fields so one verbose section cannot dominate a prompt"""
+    if isinstance(data, str):
+        return data if len(data) <= max_len else data[:max_len] + "...[truncated]"
+    if isinstance(data, dict):
+        return {key: _truncate(value, max_len) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [_truncate(value, max_len) for value in data]
+    return data
+
+
+def _compact_json(data: Any) -> str:
+    """Serialize prompt payloads as whitespace-free JSON rather than Python reprs"""
+    return json.dumps(_truncate(data), separators=(',', ':'), default=str)
+
+
+class GeminiRateLimiter:
+    """Thread-safe token bucket keeping Gemini calls under the requests-per-minute quota"""
+    
+    def __init__(self, max_rate: int, time_period: float = 60.0):
+        self.max_rate = max_rate
+        self.refill_rate = max_rate / time_period
+        self._tokens = float(max_rate)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a request slot is available"""
+        if self.max_rate <= 0:
+            return
+        
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.max_rate, self._tokens + (now - self._updated) * self.refill_rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.refill_rate
+            time.sleep(wait)
+
+
+class _SlotRequest:
+    """A concurrency slot taken on a worker thread for a coroutine that may be cancelled meanwhile"""
+    
+    __slots__ = ("_lock", "_acquired", "_abandoned")
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._acquired = False
+        self._abandoned = False
+    
+    def acquire(self, rate_limiter: GeminiRateLimiter, semaphore: threading.BoundedSemaphore):
+        """Wait for a rate-limit token and a slot, handing the slot straight back if abandoned"""
+        rate_limiter.acquire()
+        if self._abandoned:
+            return
+        semaphore.acquire()
+        with self._lock:
+            if self._abandoned:
+                semaphore.release()
+            else:
+                self._acquired = True
+    
+    def abandon(self, semaphore: threading.BoundedSemaphore):
+        """Give up the request, releasing the slot if the thread already took it"""
+        with self._lock:
+            self._abandoned = True
+            if self._acquired:
+                self._acquired = False
+                semaphore.release()
+
+
+class BaseAgent:
+    """Common execution helpers shared by all agents"""
+    
+    # Agents hold a single wrapped agno Agent, so skip the per-instance __dict__
+    __slots__ = ("agent",)
+    
+    # Process-wide cap on in-flight Gemini calls across every agent and thread
+    _concurrency = threading.BoundedSemaphore(Config.AGENT_MAX_CONCURRENCY)
+    # Shared by every agent so the combined request rate stays under the quota
+    _rate_limiter = GeminiRateLimiter(Config.GEMINI_RPM)
+    _shared_model = None
+    _model_lock = threading.Lock()
+    prompt_digest = _PROMPT_DIGEST
+    
+    @classmethod
+    def model(cls) -> Gemini:
+        """Gemini model shared by all agents so they reuse one client connection pool"""
+        with cls._model_lock:
+            if BaseAgent._shared_model is None:
+                BaseAgent._shared_model = Gemini(id=Config.GEMINI_MODEL, api_key=Config.GOOGLE_API_KEY)
+            return BaseAgent._shared_model
+    
+    def _run(self, prompt: str) -> str:
+        """Run a prompt against the underlying agent and return its content"""
+        self._rate_limiter.acquire()
+        with self._concurrency:
+            return self.agent.run(prompt).content
+    
+    async def arun(self, prompt: str) -> str:
+        """Run a prompt on agno's native async path without tying up a worker thread"""
+        # The limiter and semaphore are shared with the sync path, so wait on them off the loop
+        request = _SlotRequest()
+        try:
+            await asyncio.to_thread(request.acquire, self._rate_limiter, self._concurrency)
+        except BaseException:
+            # Cancelled while waiting (e.g. a sibling in a gather failed); the thread keeps
+            # running and may still take the slot, so make sure it is handed back
+            request.abandon(self._concurrency)
+            raise
+        try:
+            response = await self.agent.arun(prompt)
+        finally:
+            self._concurrency.release()
+        return response.content
+    
+    def stream(self, prompt: str) -> Iterator[str]:
+        """Yield response content chunks as the model generates them"""
+        self._rate_limiter.acquire()
+        with self._concurrency:
+            for chunk in self.agent.run(prompt, stream=True):
+                content = getattr(chunk, "content", None)
+                if content:
+                    yield content
+    
+    async def astream(self, prompt: str) -> AsyncIterator[str]:
+        """Async variant of stream that keeps the event loop free while generating"""
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        done = object()
+        
+        def produce():
+            try:
+                for chunk in self.stream(prompt):
+                    loop.call_soon_threadsafe(queue.put_nowait, chunk)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+        
+        producer = asyncio.ensure_future(asyncio.to_thread(produce))
+        while True:
+            chunk = await queue.get()
+            if chunk is done:
+                break
+            yield chunk
+        # Surface any error raised while generating
+        await producer
+    
+    async def stream_analysis(self, symbol: str) -> AsyncIterator[str]:
+        """Stream this agent's per-symbol analysis chunk by chunk"""
+        prompt = await asyncio.to_thread(self._analysis_prompt, symbol)
+        async for chunk in self.astream(prompt):
+            yield chunk
+    
+    def _run_batched(self, labels: List[str], build_prompt: Callable[[List[str]], str], batch_size: int) -> Dict[str, str]:
+        """Answer several items per model call, splitting the labelled sections"""
+        results = {}
+        for start in range(0, len(labels), batch_size):
+            batch = labels[start:start + batch_size]
+            sections = _split_sections(self._run(build_prompt(batch)))
+            for label in batch:
+                results[label] = sections.get(label, "Analysis not available")
+        return results
+
+
+class FinancialAnalysisAgent(BaseAgent):
     """Agent specialized in financial data analysis"""
     
+    __slots__ = ("financial_tool",)
+    
     def __init__(self):
         logger.info("Initializing Financial Analysis Agent")
-        self.financial_tool = FinancialDataTool()
+        self.financial_tool = _FINANCIAL_DATA_TOOL
         self.agent = Agent(
             name="Financial Analysis Agent",
             role="Senior Financial Analyst specializing in equity research and quantitative analysis",
-            model=Gemini(id=Config.GEMINI_MODEL, api_key=Config.GOOGLE_API_KEY),
-            tools=[FinancialDataTool()],
-            instructions=[
-                "ROLE: You are a CFA-level senior financial analyst with 15+ years of experience in equity research and investment analysis.",
-                
-                "CRITICAL DATA USAGE RULES - THIS IS MANDATORY:",
-                "- You MUST call get_stock_data() tool to get real financial data before ANY analysis",
-                "- You MUST use the EXACT numerical values returned by your tools",
-                "- NEVER EVER use placeholder values like $1, $X, $XXX, or any generic amounts",
-                "- If tool returns actual price like $415.67, you MUST use $415.67 in your response",
-                "- If tool returns actual market cap like $3.1T, you MUST use $3.1T in your response",
-                "- Every financial figure in your analysis must come from actual tool data",
-                "- If a tool returns 'N/A' or None, say 'Not Available' instead of using $1",
-                "- VERIFY: Before writing your response, check that all prices and values are from real tool data",
-                
-                "ANALYSIS FRAMEWORK: Follow a structured approach:",
-                "1. QUANTITATIVE ANALYSIS: Calculate and interpret key financial ratios (P/E, PEG, ROE, ROA, Debt-to-Equity, Current Ratio, Quick Ratio)",
-                "2. VALUATION METRICS: Assess current valuation vs. historical averages, sector peers, and market benchmarks",
-                "3. FINANCIAL HEALTH: Evaluate balance sheet strength, cash flow generation, and debt sustainability",
-                "4. GROWTH ANALYSIS: Examine revenue growth trends, margin expansion/contraction, and earnings quality",
-                "5. RISK ASSESSMENT: Identify key financial risks including liquidity, solvency, and operational risks",
-                
-                "TECHNICAL INTEGRATION: Interpret basic technical indicators (RSI, moving averages, MACD) from a fundamental perspective",
-                
-                "OUTPUT STANDARDS:",
-                "- Always lead with clear investment thesis (BUY/HOLD/SELL with specific price target)",
-                "- Provide specific numerical data from your tools - never placeholder values",
-                "- Compare against industry averages and peer companies",
-                "- Highlight 2-3 key investment drivers and 2-3 primary risks",
-                "- Use professional financial terminology appropriately",
-                "- Structure analysis with clear headers and bullet points",
-                "- MANDATORY: Include actual current stock price in your opening statement",
-                "- MANDATORY: Provide specific numerical price target based on analysis",
-                
-                "COMMUNICATION: Write for institutional investor audience - be precise, data-driven, and actionable",
-                
-                "VERIFICATION STEP: Before completing your response, verify that:",
-                "- Current stock price is an actual number (not $1 or placeholder)",
-                "- Price target is an actual number (not $1 or placeholder)", 
-                "- All financial metrics are from tool data",
-                "- No placeholder values exist in your analysis"
-            ],
+            model=BaseAgent.model(),
+            tools=[_FINANCIAL_DATA_TOOL],
+            instructions=list(FINANCIAL_INSTRUCTIONS),
             markdown=True
         )
     
     def debug_tool_data(self, symbol: str) -> Dict[str, Any]:
         """Debug method to see raw tool data"""
-        logger.info(f"DEBUG: Testing tool data for {symbol}")
         data = self.financial_tool.get_stock_data(symbol)
-        logger.info(f"DEBUG: Raw tool data: {data}")
+        logger.debug("Raw tool data for %s: %s", symbol, data)
         return data
     
-    def analyze_stock(self, symbol: str) -> str:
-        """Analyze a single stock comprehensively"""
-        logger.info(f"Financial agent analyzing stock: {symbol}")
-        
-        # Get tool data first
-        debug_data = self.debug_tool_data(symbol)
+    def _prefetch_indicators(self, symbol: str) -> Future:
+        """Start fetching technical indicators on the prefetch pool"""
+        return _PREFETCH_POOL.submit(self.financial_tool.calculate_technical_indicators, symbol)
+    
+    def _analysis_prompt(self, symbol: str, debug_data: Dict[str, Any] = None, indicators: Optional[Future] = None) -> str:
+        """Build the single-stock analysis prompt with real tool data injected"""
+        # Fetch indicators alongside the stock data so the model never has to call either tool;
+        # callers that fetch the stock data themselves start them first and pass the future
+        if indicators is None:
+            indicators = self._prefetch_indicators(symbol)
+        if debug_data is None:
+            debug_data = self.debug_tool_data(symbol)
         current_price = debug_data.get('current_price')
         market_cap = debug_data.get('market_cap_formatted', 'N/A')
         pe_ratio = debug_data.get('pe_ratio', 'N/A')
         
         # Extract real data for prompt
-        prompt = f"""
-        You are a senior financial analyst. Perform a comprehensive financial analysis of {symbol}.
-
-        CRITICAL DATA INJECTION: I am providing you with REAL data that you MUST use exactly as provided:
-        - CURRENT STOCK PRICE: ${current_price}
-        - MARKET CAP: {market_cap}  
-        - P/E RATIO: {pe_ratio}
-
-        ABSOLUTE REQUIREMENTS:
-        1. Call get_stock_data("{symbol}") to get additional financial metrics
-        2. Call calculate_technical_indicators("{symbol}") for technical analysis
-        3. Use the REAL DATA I provided above - DO NOT use $1, $X, or any placeholders
-        4. Your response MUST start with: "Current Stock Price: ${current_price}"
-        5. Calculate a realistic price target based on the current price of ${current_price}
-
-        MANDATORY FORMAT:
-        Current Stock Price: ${current_price}
-        12-Month Price Target: $[Calculate realistic target based on ${current_price}]
-        Market Capitalization: {market_cap}
-        P/E Ratio: {pe_ratio}
-        Recommendation: [BUY/HOLD/SELL]
-
-        [Then provide detailed analysis using the real data]
-
-        VERIFICATION: Every financial figure in your response must be real - no $1 values allowed.
-        """
+        return _FINANCIAL_ANALYSIS_TPL.substitute(
+            symbol=symbol,
+            current_price=current_price,
+            market_cap=market_cap,
+            pe_ratio=pe_ratio,
+            stock_data=_compact_json(debug_data),
+            indicators=_compact_json(indicators.result())
+        )
+    
+    def analyze_stock(self, symbol: str) -> str:
+        """Analyze a single stock comprehensively"""
+        return asyncio.run(self.analyze_stock_async(symbol))
+    
+    @cached()
+    async def analyze_stock_async(self, symbol: str) -> str:
+        """Analyze a single stock comprehensively"""
+        logger.info("Financial agent analyzing stock: %s", symbol)
         
-        result = self.agent.run(prompt).content
+        # Get tool data first, with the indicators fetching in parallel
+        indicators = self._prefetch_indicators(symbol)
+        debug_data = await asyncio.to_thread(self.debug_tool_data, symbol)
+        current_price = debug_data.get('current_price')
+        
+        prompt = await asyncio.to_thread(self._analysis_prompt, symbol, debug_data, indicators)
+        result = await self.arun(prompt)
         
         # Force replacement of any remaining $1 with real data
         if "$1" in result and current_price:
@@ -123,13 +572,30 @@ class FinancialAnalysisAgent:
     
     def compare_stocks(self, symbols: list) -> str:
         """Compare multiple stocks"""
+        return asyncio.run(self.compare_stocks_async(symbols))
+    
+    @cached()
+    async def compare_stocks_async(self, symbols: list) -> str:
+        """Compare multiple stocks"""
+        logger.info("Financial agent comparing stocks: %s", ", ".join(symbols))
+        
+        prompt, stock_data = await asyncio.to_thread(self._compare_prompt, symbols)
+        result = await self.arun(prompt)
+        
+        # Force replacement of any $1 with real prices
+        for symbol, data in stock_data.items():
+            if data['price'] and "$1" in result:
+                result = result.replace("$1", f"${data['price']}", 1)
+        
+        return result
+    
+    def _compare_prompt(self, symbols: list) -> Tuple[str, Dict[str, Dict[str, Any]]]:
+        """Build the comparison prompt, returning it with the real data it injects"""
         symbols_str = ", ".join(symbols)
-        logger.info(f"Financial agent comparing stocks: {symbols_str}")
         
-        # Get tool data for all symbols and extract real prices
+        # Get tool data for all symbols in one batched download and extract real prices
         stock_data = {}
-        for symbol in symbols:
-            debug_data = self.debug_tool_data(symbol)
+        for symbol, debug_data in self.financial_tool.get_stock_data_batch(symbols).items():
             current_price = debug_data.get('current_price')
             market_cap = debug_data.get('market_cap_formatted', 'N/A')
             pe_ratio = debug_data.get('pe_ratio', 'N/A')
@@ -144,381 +610,213 @@ class FinancialAnalysisAgent:
         for symbol, data in stock_data.items():
             real_data_text += f"- {symbol}: Current Price ${data['price']}, Market Cap {data['market_cap']}, P/E {data['pe_ratio']}\n"
         
-        prompt = f"""
-        You are a senior financial analyst. Compare the following stocks: {symbols_str}
-
-        {real_data_text}
-
-        CRITICAL INSTRUCTION: Use the REAL DATA provided above. Never use placeholder values like $1, $X, or $XXX.
-
-        MANDATORY STEPS:
-        1. For EACH stock ({symbols_str}), call get_stock_data() to get additional financial metrics
-        2. For EACH stock, call calculate_technical_indicators() for technical data
-        3. Use the REAL PRICES I provided above in your comparison table
-
-        Create a comparison table with the REAL data including:
-        - Current stock prices (use the exact values from the real data above)
-        - Market capitalizations (use the exact values from the real data above)
-        - P/E ratios (use the exact values from the real data above)
-        - Technical indicators and investment rankings
-
-        VERIFICATION: Every price in your comparison must match the real data provided above.
-        """
+        prompt = _COMPARE_STOCKS_TPL.substitute(symbols_str=symbols_str, real_data_text=real_data_text)
+        return prompt, stock_data
+    
+    def analyze_stocks_batched(self, symbols: list, batch_size: int = Config.AGENT_BATCH_SIZE) -> Dict[str, str]:
+        """Analyze several stocks, packing up to batch_size symbols into each model call"""
+        logger.info("Financial agent batch analyzing stocks: %s", ", ".join(symbols))
         
-        result = self.agent.run(prompt).content
+        stock_data = self.financial_tool.get_stock_data_batch(symbols)
         
-        # Force replacement of any $1 with real prices
-        for symbol, data in stock_data.items():
-            if data['price'] and "$1" in result:
-                result = result.replace("$1", f"${data['price']}", 1)
+        def build_prompt(batch):
+            real_data_text = "REAL STOCK DATA TO USE:\n"
+            for symbol in batch:
+                data = stock_data[symbol]
+                real_data_text += f"- {symbol}: Current Price ${data.get('current_price')}, Market Cap {data.get('market_cap_formatted', 'N/A')}, P/E {data.get('pe_ratio', 'N/A')}\n"
+            
+            return _FINANCIAL_BATCH_TPL.substitute(batch_header=_batch_prompt_header(batch), real_data_text=real_data_text)
         
-        return result
+        results = self._run_batched(symbols, build_prompt, batch_size)
+        
+        # Force replacement of any remaining $1 with each symbol's real price
+        for symbol, result in results.items():
+            current_price = stock_data[symbol].get('current_price')
+            if "$1" in result and current_price:
+                results[symbol] = result.replace("$1", f"${current_price}")
+        
+        return results
 
 
-class WebResearchAgent:
+class WebResearchAgent(BaseAgent):
     """Agent specialized in web research and news analysis"""
     
+    __slots__ = ()
+    
     def __init__(self):
         logger.info("Initializing Web Research Agent")
         self.agent = Agent(
             name="Web Research Agent", 
             role="Senior Market Research Analyst specializing in news analysis and market sentiment",
-            model=Gemini(id=Config.GEMINI_MODEL, api_key=Config.GOOGLE_API_KEY),
-            tools=[WebResearchTool()],
-            instructions=[
-                "ROLE: You are a senior market research analyst with expertise in information synthesis, sentiment analysis, and market intelligence gathering.",
-                
-                "RESEARCH METHODOLOGY:",
-                "1. SOURCE PRIORITIZATION: Focus on credible financial news sources (Reuters, Bloomberg, WSJ, Financial Times, company press releases)",
-                "2. RECENCY FILTER: Prioritize information from the last 30 days, noting publication dates",
-                "3. MATERIALITY ASSESSMENT: Distinguish between market-moving news and routine updates",
-                "4. SENTIMENT ANALYSIS: Categorize sentiment as POSITIVE/NEUTRAL/NEGATIVE with supporting evidence",
-                "5. IMPACT EVALUATION: Assess potential short-term and long-term market implications",
-                
-                "ANALYSIS FRAMEWORK:",
-                "- EARNINGS & FINANCIALS: Revenue beats/misses, guidance changes, margin impacts",
-                "- STRATEGIC DEVELOPMENTS: M&A activity, partnerships, new product launches, market expansion",
-                "- REGULATORY & LEGAL: Compliance issues, regulatory approvals, litigation updates",
-                "- INDUSTRY TRENDS: Sector rotation, competitive dynamics, technological disruption",
-                "- MACROECONOMIC FACTORS: Interest rate impacts, economic indicators, geopolitical events",
-                
-                "OUTPUT STRUCTURE:",
-                "1. EXECUTIVE SUMMARY: 2-3 sentence overview of key findings and market sentiment",
-                "2. KEY DEVELOPMENTS: Chronological list of material news with dates and sources",
-                "3. SENTIMENT ANALYSIS: Overall market sentiment with supporting evidence",
-                "4. MARKET IMPLICATIONS: Potential stock price catalysts and risks identified",
-                "5. MONITORING POINTS: Upcoming events or developments to watch",
-                
-                "CRITICAL: Always return your analysis as a single coherent text string, not as an object or complex data structure.",
-                
-                "QUALITY STANDARDS: Always include source attribution, distinguish facts from opinions, and provide balanced perspective on both positive and negative developments"
-            ],
+            model=BaseAgent.model(),
+            tools=[_WEB_TOOL],
+            instructions=list(RESEARCH_INSTRUCTIONS),
             markdown=True
         )
     
+    def _analysis_prompt(self, company: str) -> str:
+        """Build the per-symbol prompt shared by research_company_news and stream_analysis"""
+        news = _WEB_TOOL.search_news(company)
+        return _COMPANY_NEWS_TPL.substitute(company=company, news=_compact_json(news))
+    
     def research_company_news(self, company: str) -> str:
         """Research recent news about a company"""
-        logger.info(f"Web research agent researching: {company}")
-        prompt = f"""
-        Research recent news and developments about {company}. 
-        
-        Find and analyze:
-        1. Recent news articles (last 30 days)
-        2. Major announcements or events
-        3. Market sentiment analysis
-        4. Industry trends affecting the company
-        5. Overall news impact on stock performance
-        
-        Use web search tools to gather current information.
-        Return your analysis as a single text response.
-        """
-        return self.agent.run(prompt).content
+        return asyncio.run(self.research_company_news_async(company))
     
+    @cached()
+    async def research_company_news_async(self, company: str) -> str:
+        """Research recent news about a company"""
+        logger.info("Web research agent researching: %s", company)
+        prompt = await asyncio.to_thread(self._analysis_prompt, company)
+        return await self.arun(prompt)
+    
+    @cached()
     def analyze_market_sentiment(self, topic: str) -> str:
         """Analyze market sentiment on a specific topic"""
-        logger.info(f"Web research agent analyzing sentiment for: {topic}")
-        prompt = f"""
-        Analyze current market sentiment regarding {topic}.
-        
-        Research:
-        1. Recent market discussions and news
-        2. Analyst opinions and reports
-        3. Social media and forum sentiment
-        4. Overall market mood and trends
-        5. Potential impact on related stocks
-        
-        Use search tools to gather diverse perspectives.
-        Return your analysis as a single coherent text response.
-        """
-        return self.agent.run(prompt).content
+        logger.info("Web research agent analyzing sentiment for: %s", topic)
+        prompt = _MARKET_SENTIMENT_TPL.substitute(topic=topic)
+        return self._run(prompt)
 
 
-class CompetitiveIntelligenceAgent:
+class CompetitiveIntelligenceAgent(BaseAgent):
     """Agent specialized in competitive analysis"""
     
+    __slots__ = ()
+    
     def __init__(self):
         logger.info("Initializing Competitive Intelligence Agent")
         self.agent = Agent(
             name="Competitive Intelligence Agent",
             role="Senior Strategic Analyst specializing in competitive landscape and industry analysis", 
-            model=Gemini(id=Config.GEMINI_MODEL, api_key=Config.GOOGLE_API_KEY),
-            tools=[CompetitiveAnalysisTool(), FinancialDataTool()],
-            instructions=[
-                "ROLE: You are a senior strategic analyst with MBA-level expertise in competitive strategy, industry analysis, and market positioning assessment.",
-                
-                "ANALYTICAL FRAMEWORK - Apply Porter's Five Forces and strategic analysis:",
-                "1. COMPETITIVE RIVALRY: Market share dynamics, pricing power, differentiation strategies",
-                "2. SUPPLIER POWER: Supply chain dependencies, input cost pressures, strategic partnerships", 
-                "3. BUYER POWER: Customer concentration, switching costs, value proposition strength",
-                "4. THREAT OF SUBSTITUTES: Alternative solutions, technological disruption, market evolution",
-                "5. BARRIERS TO ENTRY: Capital requirements, regulatory moats, network effects, brand strength",
-                
-                "COMPETITIVE ANALYSIS METHODOLOGY:",
-                "- PEER IDENTIFICATION: Select 3-5 most relevant competitors based on revenue size, market focus, and business model",
-                "- FINANCIAL BENCHMARKING: Compare margins, growth rates, ROE, debt levels, and valuation multiples",
-                "- STRATEGIC POSITIONING: Assess market share, geographic presence, product portfolio breadth",
-                "- COMPETITIVE ADVANTAGES: Identify sustainable competitive moats (cost, differentiation, niche focus)",
-                "- PERFORMANCE TRENDS: Analyze 3-year performance trajectories and market share evolution",
-                
-                "STRATEGIC ASSESSMENT AREAS:",
-                "- MARKET LEADERSHIP: Revenue rank, market share, brand recognition within sector",
-                "- OPERATIONAL EFFICIENCY: Margin comparisons, asset utilization, cost structure analysis", 
-                "- GROWTH POSITIONING: R&D investment, geographic expansion, new market entry capabilities",
-                "- FINANCIAL STRENGTH: Balance sheet quality, cash generation, financial flexibility vs peers",
-                
-                "OUTPUT STRUCTURE:",
-                "1. COMPETITIVE POSITIONING SUMMARY: Current market position and key differentiators",
-                "2. PEER COMPARISON TABLE: Financial metrics vs 3-5 key competitors",
-                "3. COMPETITIVE ADVANTAGES: Sustainable moats and strategic strengths",
-                "4. COMPETITIVE THREATS: Key risks from existing players and potential disruptors",
-                "5. STRATEGIC RECOMMENDATIONS: Actionable insights for competitive positioning",
-                
-                "COMMUNICATION: Deliver McKinsey-level strategic insights with clear data support and actionable recommendations"
-            ],
+            model=BaseAgent.model(),
+            tools=[_COMPETITIVE_TOOL, _FINANCIAL_DATA_TOOL],
+            instructions=list(COMPETITIVE_INSTRUCTIONS),
             markdown=True
         )
     
+    def _analysis_prompt(self, company: str) -> str:
+        """Build the per-symbol prompt shared by analyze_competitive_landscape and stream_analysis"""
+        return _COMPETITIVE_LANDSCAPE_TPL.substitute(company=company)
+    
     def analyze_competitive_landscape(self, company: str) -> str:
         """Analyze competitive landscape for a company"""
-        logger.info(f"Competitive agent analyzing landscape for: {company}")
-        prompt = f"""
-        Analyze the competitive landscape for {company}.
-        
-        Perform:
-        1. Identify main competitors in the same sector
-        2. Compare financial performance vs competitors
-        3. Analyze competitive advantages and weaknesses
-        4. Market share and positioning analysis
-        5. Competitive threats and opportunities
-        
-        Use competitive analysis tools to gather comparison data.
-        """
-        return self.agent.run(prompt).content
+        return asyncio.run(self.analyze_competitive_landscape_async(company))
     
+    @cached()
+    async def analyze_competitive_landscape_async(self, company: str) -> str:
+        """Analyze competitive landscape for a company"""
+        logger.info("Competitive agent analyzing landscape for: %s", company)
+        prompt = await asyncio.to_thread(self._analysis_prompt, company)
+        return await self.arun(prompt)
+    
+    @cached()
     def compare_sector_leaders(self, sector: str) -> str:
         """Compare leading companies in a sector"""
-        logger.info(f"Competitive agent comparing sector leaders in: {sector}")
-        prompt = f"""
-        Compare the leading companies in the {sector} sector.
+        logger.info("Competitive agent comparing sector leaders in: %s", sector)
+        prompt = _SECTOR_LEADERS_TPL.substitute(sector=sector)
+        return self._run(prompt)
+    
+    def compare_sector_leaders_batched(self, sectors: list, batch_size: int = Config.AGENT_BATCH_SIZE) -> Dict[str, str]:
+        """Compare sector leaders for several sectors, packing sectors into each model call"""
+        logger.info("Competitive agent batch comparing sector leaders in: %s", ", ".join(sectors))
         
-        Analyze:
-        1. Top companies by market cap and performance
-        2. Financial metrics comparison
-        3. Competitive positioning
-        4. Growth prospects and strategies
-        5. Investment attractiveness ranking
+        def build_prompt(batch):
+            return _SECTOR_LEADERS_BATCH_TPL.substitute(batch_header=_batch_prompt_header(batch))
         
-        Use tools to get real financial data for comparison.
-        """
-        return self.agent.run(prompt).content
+        return self._run_batched(sectors, build_prompt, batch_size)
 
 
-class TechnicalAnalysisAgent:
+class TechnicalAnalysisAgent(BaseAgent):
     """Agent specialized in technical analysis"""
     
+    __slots__ = ()
+    
     def __init__(self):
         logger.info("Initializing Technical Analysis Agent")
         self.agent = Agent(
             name="Technical Analysis Agent",
             role="Senior Technical Analyst specializing in quantitative market analysis and chart pattern recognition",
-            model=Gemini(id=Config.GEMINI_MODEL, api_key=Config.GOOGLE_API_KEY),
-            tools=[FinancialDataTool(), ChartGenerationTool()],
-            instructions=[
-                "ROLE: You are a Chartered Market Technician (CMT) with 10+ years of experience in quantitative technical analysis and systematic trading strategies.",
-                
-                "TECHNICAL ANALYSIS METHODOLOGY - Apply systematic approach:",
-                "1. TREND ANALYSIS: Identify primary, secondary, and minor trends using multiple timeframes",
-                "2. MOMENTUM INDICATORS: RSI, MACD, Stochastic - interpret overbought/oversold conditions with context",
-                "3. MOVING AVERAGES: Analyze 20, 50, 200-day SMAs for support/resistance and trend confirmation",
-                "4. VOLUME ANALYSIS: Assess volume patterns for trend confirmation and potential reversals",
-                "5. SUPPORT/RESISTANCE: Identify key price levels using historical pivots and psychological levels",
-                
-                "INDICATOR INTERPRETATION STANDARDS:",
-                "- RSI: <30 oversold, >70 overbought, look for divergences and trend confirmation",
-                "- MACD: Signal line crosses, histogram patterns, bullish/bearish divergences",
-                "- MOVING AVERAGES: Golden cross (50>200), death cross (50<200), price vs MA relationships",
-                "- VOLUME: On-balance volume, volume spike analysis, accumulation/distribution patterns",
-                
-                "RISK MANAGEMENT FRAMEWORK:",
-                "- PROBABILITY ASSESSMENT: Assign confidence levels (High/Medium/Low) to technical signals",
-                "- RISK/REWARD RATIOS: Calculate potential upside vs downside for entry points",
-                "- STOP LOSS LEVELS: Identify logical stop loss levels based on technical support",
-                "- POSITION SIZING: Recommend position size based on volatility and risk tolerance",
-                
-                "TIMEFRAME ANALYSIS:",
-                "- SHORT-TERM (1-4 weeks): Focus on momentum indicators and short-term patterns",
-                "- MEDIUM-TERM (1-6 months): Emphasize trend analysis and moving average relationships",
-                "- LONG-TERM (6+ months): Consider major support/resistance and secular trends",
-                
-                "OUTPUT STRUCTURE:",
-                "1. TECHNICAL SUMMARY: Overall technical outlook (BULLISH/NEUTRAL/BEARISH) with confidence level",
-                "2. KEY INDICATORS: Current readings of RSI, MACD, moving averages with interpretation",
-                "3. SUPPORT/RESISTANCE LEVELS: Specific price levels for entries, stops, and targets",
-                "4. VOLUME ANALYSIS: Volume trend assessment and accumulation/distribution signals",
-                "5. TRADING RECOMMENDATIONS: Specific entry points, stop losses, and price targets with timeframes",
-                
-                "PROFESSIONAL STANDARDS: Use precise technical terminology, provide specific price levels, and always include risk management considerations in recommendations"
-            ],
+            model=BaseAgent.model(),
+            tools=[_FINANCIAL_DATA_TOOL, _CHART_TOOL],
+            instructions=list(TECHNICAL_INSTRUCTIONS),
             markdown=True
         )
     
+    def _analysis_prompt(self, symbol: str) -> str:
+        """Build the per-symbol prompt shared by technical_analysis and stream_analysis"""
+        indicators = _FINANCIAL_DATA_TOOL.calculate_technical_indicators(symbol)
+        return _TECHNICAL_ANALYSIS_TPL.substitute(symbol=symbol, indicators=_compact_json(indicators))
+    
     def technical_analysis(self, symbol: str) -> str:
         """Perform comprehensive technical analysis"""
-        logger.info(f"Technical agent analyzing: {symbol}")
-        prompt = f"""
-        Perform detailed technical analysis for {symbol}.
-        
-        Analyze:
-        1. Current technical indicators (RSI, MACD, Moving Averages)
-        2. Price trends and momentum
-        3. Support and resistance levels
-        4. Trading volume analysis
-        5. Short-term and medium-term outlook
-        6. Entry/exit points for traders
-        
-        Use technical analysis tools and generate relevant charts.
-        """
-        return self.agent.run(prompt).content
+        return asyncio.run(self.technical_analysis_async(symbol))
+    
+    @cached()
+    async def technical_analysis_async(self, symbol: str) -> str:
+        """Perform comprehensive technical analysis"""
+        logger.info("Technical agent analyzing: %s", symbol)
+        prompt = await asyncio.to_thread(self._analysis_prompt, symbol)
+        return await self.arun(prompt)
     
+    @cached()
     def chart_analysis(self, symbols: list) -> str:
         """Generate and analyze charts for multiple symbols"""
         symbols_str = ", ".join(symbols)
-        logger.info(f"Technical agent creating charts for: {symbols_str}")
-        prompt = f"""
-        Generate and analyze charts for: {symbols_str}
+        logger.info("Technical agent creating charts for: %s", symbols_str)
+        prompt = _CHART_ANALYSIS_TPL.substitute(symbols_str=symbols_str)
+        return self._run(prompt)
+    
+    def chart_analysis_batched(self, symbols: list, batch_size: int = Config.AGENT_BATCH_SIZE) -> Dict[str, str]:
+        """Chart analysis per symbol, packing up to batch_size symbols into each model call"""
+        logger.info("Technical agent batch analyzing charts for: %s", ", ".join(symbols))
         
-        Create:
-        1. Individual price charts with technical indicators
-        2. Comparative performance chart
-        3. Technical pattern identification
-        4. Trend analysis and projections
-        5. Trading recommendations based on charts
+        def build_prompt(batch):
+            return _CHART_ANALYSIS_BATCH_TPL.substitute(batch_header=_batch_prompt_header(batch))
         
-        Use chart generation tools to create visualizations.
-        """
-        return self.agent.run(prompt).content
+        return self._run_batched(symbols, build_prompt, batch_size)
 
 
-class ReportGenerationAgent:
+class ReportGenerationAgent(BaseAgent):
     """Agent specialized in synthesizing analysis into comprehensive reports"""
     
+    __slots__ = ()
+    
     def __init__(self):
         logger.info("Initializing Report Generation Agent")
         self.agent = Agent(
             name="Report Generation Agent",
             role="Senior Investment Research Director specializing in institutional-grade equity research reports",
-            model=Gemini(id=Config.GEMINI_MODEL, api_key=Config.GOOGLE_API_KEY),
-            tools=[ReportGenerationTool(), ChartGenerationTool()],
-            instructions=[
-                "ROLE: You are a Managing Director of Equity Research with 20+ years of experience writing institutional-quality investment reports for hedge funds, mutual funds, and high-net-worth clients.",
-                
-                "REPORT WRITING STANDARDS - Follow Goldman Sachs/Morgan Stanley quality:",
-                "1. EXECUTIVE SUMMARY: Lead with clear investment recommendation, price target, and 2-3 key investment points",
-                "2. INVESTMENT THESIS: Articulate compelling 3-point investment case with quantifiable drivers",
-                "3. VALUATION FRAMEWORK: Present multiple valuation approaches (DCF, comparable multiples, sum-of-parts)",
-                "4. RISK ASSESSMENT: Identify and quantify key risks with probability-weighted impact analysis",
-                "5. CATALYSTS: Outline specific near-term and long-term value drivers with timelines",
-                
-                "ANALYTICAL INTEGRATION METHODOLOGY:",
-                "- FINANCIAL ANALYSIS SYNTHESIS: Extract key metrics, growth drivers, and margin trends",
-                "- NEWS IMPACT ASSESSMENT: Incorporate recent developments into forward-looking analysis",
-                "- COMPETITIVE POSITIONING: Integrate competitive dynamics into market share and margin outlook",
-                "- TECHNICAL CONFLUENCE: Use technical analysis to inform entry timing and risk management",
-                
-                "CRITICAL DATA HANDLING:",
-                "- NEVER use placeholder values like $1, $X, or $XXX in reports",
-                "- Extract actual numerical values from provided analysis data",
-                "- If no real price data is available, state 'Price data unavailable' instead of using $1",
-                "- Verify all financial figures are realistic and not placeholder values",
-                
-                "PROFESSIONAL REPORT STRUCTURE:",
-                "**EXECUTIVE SUMMARY** (2-3 paragraphs):",
-                "- Investment recommendation (BUY/HOLD/SELL) with 12-month price target",
-                "- Core investment thesis in 3 key points",
-                "- Primary risk factors and catalysts",
-                
-                "**INVESTMENT HIGHLIGHTS** (Bullet format):",
-                "- 3-5 compelling investment drivers with quantified impact",
-                "- Competitive advantages and market positioning",
-                "- Financial performance trajectory and margin outlook",
-                
-                "**VALUATION ANALYSIS**:",
-                "- Multiple valuation methodologies with justified assumptions",
-                "- Peer comparison with premium/discount analysis",
-                "- Sensitivity analysis for key variables",
-                
-                "**RISK FACTORS**:",
-                "- 3-5 key risks with probability assessment (High/Medium/Low)",
-                "- Quantified potential impact on price target",
-                "- Risk mitigation strategies and monitoring points",
-                
-                "**INVESTMENT TIMELINE**:",
-                "- Near-term catalysts (0-6 months)",
-                "- Medium-term value drivers (6-18 months)",
-                "- Long-term strategic positioning (18+ months)",
-                
-                "COMMUNICATION EXCELLENCE:",
-                "- Write for sophisticated institutional investors",
-                "- Use precise financial terminology and specific data points",
-                "- Maintain objectivity while conveying conviction",
-                "- Provide actionable insights with clear next steps",
-                "- Structure content with clear headers and professional formatting",
-                
-                "QUALITY CONTROL: Ensure all recommendations are data-driven, risk-adjusted, and suitable for fiduciary investment decisions"
-            ],
+            model=BaseAgent.model(),
+            tools=[_REPORT_TOOL, _CHART_TOOL],
+            instructions=list(REPORT_INSTRUCTIONS),
             markdown=True
         )
     
-    def generate_investment_report(self, symbol: str, analysis_data: Dict[str, Any]) -> str:
-        """Generate comprehensive investment report"""
-        logger.info(f"Report agent generating investment report for: {symbol}")
-        
+    def _report_prompt(self, symbol: str, analysis_data: Dict[str, Any]) -> Tuple[str, Any]:
+        """Build the investment report prompt, returning it with the real price used"""
         # Extract real price data from financial analysis
         financial_analysis = analysis_data.get('financial_analysis', '')
         real_price = None
         real_market_cap = None
         
         # Try to extract real price from financial analysis text
-        import re
-        price_match = re.search(r'Current Stock Price[:\s]*\$?([\d,]+\.?\d*)', financial_analysis, re.IGNORECASE)
+        price_match = _PRICE_RE.search(financial_analysis)
         if price_match:
             real_price = price_match.group(1)
         
-        market_cap_match = re.search(r'Market Cap[italization]*[:\s]*\$?([\d,]+\.?\d*[KMB]?)', financial_analysis, re.IGNORECASE)
+        market_cap_match = _MARKET_CAP_RE.search(financial_analysis)
         if market_cap_match:
             real_market_cap = market_cap_match.group(1)
         
         # If no price found, try to get it directly from tools
         if not real_price:
             try:
-                from tools import FinancialDataTool
-                tool = FinancialDataTool()
-                tool_data = tool.get_stock_data(symbol)
+                tool_data = _FINANCIAL_DATA_TOOL.get_price_summary(symbol)
                 if tool_data.get('current_price'):
                     real_price = str(tool_data['current_price'])
                     real_market_cap = tool_data.get('market_cap_formatted', 'N/A')
             except Exception as e:
-                logger.error(f"Failed to get fallback price data: {e}")
+                logger.error("Failed to get fallback price data: %s", e)
         
         # Calculate realistic price target based on current price
         price_target = "N/A"
@@ -530,36 +828,27 @@ class ReportGenerationAgent:
             except:
                 price_target = "N/A"
         
-        prompt = f"""
-        You are a Managing Director of Equity Research. Generate a comprehensive investment report for {symbol}.
-
-        CRITICAL REAL DATA TO USE:
-        - CURRENT STOCK PRICE: ${real_price if real_price else 'N/A'}
-        - MARKET CAPITALIZATION: ${real_market_cap if real_market_cap else 'N/A'} 
-        - CALCULATED PRICE TARGET: ${price_target}
-
-        Analysis Data Provided:
-        {analysis_data}
-
-        ABSOLUTE REQUIREMENTS:
-        1. Use the REAL DATA provided above - never use $1, $X, or placeholders
-        2. Start your report with the exact format below using real numbers
-        3. Calculate recommendations based on the real current price of ${real_price}
-
-        MANDATORY REPORT FORMAT:
-        **INVESTMENT REPORT: {symbol}**
-
-        **Current Price**: ${real_price if real_price else 'N/A'}
-        **12-Month Price Target**: ${price_target}
-        **Market Capitalization**: ${real_market_cap if real_market_cap else 'N/A'}
-        **Recommendation**: [BUY/HOLD/SELL based on analysis]
-
-        [Then provide detailed rationale using the real financial data]
-
-        CRITICAL: Every financial number must be real - absolutely no $1 values allowed.
-        """
+        prompt = _INVESTMENT_REPORT_TPL.substitute(
+            symbol=symbol,
+            price=real_price if real_price else 'N/A',
+            market_cap=real_market_cap if real_market_cap else 'N/A',
+            price_target=price_target,
+            analysis_data=_compact_json(analysis_data),
+            real_price=real_price
+        )
         
-        result = self.agent.run(prompt).content
+        return prompt, real_price
+    
+    def generate_investment_report(self, symbol: str, analysis_data: Dict[str, Any]) -> str:
+        """Generate comprehensive investment report"""
+        return asyncio.run(self.generate_investment_report_async(symbol, analysis_data))
+    
+    async def generate_investment_report_async(self, symbol: str, analysis_data: Dict[str, Any]) -> str:
+        """Generate comprehensive investment report"""
+        logger.info("Report agent generating investment report for: %s", symbol)
+        
+        prompt, real_price = await asyncio.to_thread(self._report_prompt, symbol, analysis_data)
+        result = await self.arun(prompt)
         
         # Aggressive post-processing to replace any remaining $1 with real data
         if "$1" in result and real_price:
@@ -567,60 +856,250 @@ class ReportGenerationAgent:
         
         return result
     
+    @staticmethod
+    def _job_key(job_id: str) -> str:
+        # Deferred reports share the task store with /analyze/async jobs, in their own namespace
+        return f"report:{job_id}"
+    
+    def submit_report(self, symbol: str, analysis_data: Dict[str, Any]) -> str:
+        """Queue report generation in the background and return a job id to poll"""
+        job_id = secrets.token_hex(16)
+        # Kept in the task store (Redis when configured) so any worker can answer the poll
+        task_store.set(self._job_key(job_id), {"job_id": job_id, "symbol": symbol, "status": "pending"})
+        
+        _REPORT_POOL.submit(self._run_report_job, job_id, symbol, analysis_data)
+        logger.info("Report agent queued investment report %s for: %s", job_id, symbol)
+        return job_id
+    
+    def get_report(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the status of a deferred report, with the report once completed"""
+        return task_store.get(self._job_key(job_id))
+    
+    def _run_report_job(self, job_id: str, symbol: str, analysis_data: Dict[str, Any]):
+        """Generate a queued report and record the outcome on its job"""
+        key = self._job_key(job_id)
+        task_store.set(key, {"status": "processing"})
+        try:
+            update = {"status": "completed", "report": self.generate_investment_report(symbol, analysis_data)}
+        except Exception as e:
+            logger.error("Deferred report %s failed for %s: %s", job_id, symbol, e)
+            update = {"status": "failed", "error": str(e)}
+        
+        task_store.set(key, update)
+    
     def create_market_summary(self, market_data: Dict[str, Any]) -> str:
         """Create market summary report"""
         logger.info("Report agent creating market summary")
-        prompt = f"""
-        Create a comprehensive market summary report using the provided data.
+        prompt = _MARKET_SUMMARY_TPL.substitute(market_data=_compact_json(market_data))
+        return self._run(prompt)
+
+
+class AgentOrchestrator:
+    """Coordinates agents, running independent analyses concurrently"""
+    
+    def __init__(self, agents: Dict[str, Any]):
+        self.agents = agents
+    
+    async def analyze_symbol_async(self, symbol: str, defer_report: bool = False) -> Dict[str, Any]:
+        """Run the independent agents concurrently, then generate or queue the report"""
+        logger.info("Orchestrator fanning out analysis for %s", symbol)
+        
+        # Independent agents share the event loop, so their model calls overlap
+        financial_analysis, technical_analysis, news_analysis, competitive_analysis = await asyncio.gather(
+            self.agents["financial"].analyze_stock_async(symbol),
+            self.agents["technical"].technical_analysis_async(symbol),
+            self.agents["research"].research_company_news_async(symbol),
+            self.agents["competitive"].analyze_competitive_landscape_async(symbol)
+        )
         
-        Include:
-        1. Market Overview and key themes
-        2. Sector Performance Analysis
-        3. Notable Company Highlights
-        4. Technical Market Conditions
-        5. News and Sentiment Summary
-        6. Investment Opportunities and Risks
+        analysis = {
+            "financial_analysis": financial_analysis,
+            "technical_analysis": technical_analysis,
+            "news_analysis": news_analysis,
+            "competitive_analysis": competitive_analysis
+        }
+        report_data = dict(analysis, timestamp=datetime.now().isoformat())
         
-        Market Data:
-        {market_data}
+        # The report depends on every upstream result, so it runs last, or in
+        # the background when the caller will poll for it
+        if defer_report:
+            analysis["final_report"] = None
+            analysis["report_job_id"] = self.agents["report"].submit_report(symbol, report_data)
+        else:
+            analysis["final_report"] = await self.agents["report"].generate_investment_report_async(symbol, report_data)
         
-        Present as a professional market briefing.
-        Return your report as a single coherent text response.
-        """
-        return self.agent.run(prompt).content
+        return analysis
+    
+    async def compare_symbols_async(self, symbols: List[str]) -> Dict[str, Any]:
+        """Run the financial, chart and per-symbol competitive comparisons concurrently"""
+        logger.info("Orchestrator fanning out comparison for %s", ", ".join(symbols))
+        
+        competitive = self.agents["competitive"]
+        # Every call waits on Gemini, and the agents' shared semaphore still caps how many overlap
+        financial_comparison, technical_comparison, *competitive_results = await asyncio.gather(
+            self.agents["financial"].compare_stocks_async(symbols),
+            asyncio.to_thread(self.agents["technical"].chart_analysis, symbols),
+            *(competitive.analyze_competitive_landscape_async(symbol) for symbol in symbols)
+        )
+        
+        return {
+            "financial_comparison": financial_comparison,
+            "technical_comparison": technical_comparison,
+            "competitive_analyses": dict(zip(symbols, competitive_results))
+        }
+    
+    async def stream_symbol_async(self, symbol: str) -> AsyncIterator[Tuple[str, str]]:
+        """Stream (section, chunk) pairs as the agents generate, ending with the report"""
+        logger.info("Orchestrator streaming analysis for %s", symbol)
+        
+        sections = {
+            "financial_analysis": self.agents["financial"],
+            "technical_analysis": self.agents["technical"],
+            "news_analysis": self.agents["research"],
+            "competitive_analysis": self.agents["competitive"]
+        }
+        queue = asyncio.Queue()
+        done = object()
+        collected = {name: [] for name in sections}
+        
+        async def pump(name, agent):
+            try:
+                async for chunk in agent.stream_analysis(symbol):
+                    await queue.put((name, chunk))
+            finally:
+                await queue.put((name, done))
+        
+        # Independent agents stream side by side into a single queue
+        pumps = [asyncio.ensure_future(pump(name, agent)) for name, agent in sections.items()]
+        remaining = len(pumps)
+        while remaining:
+            name, chunk = await queue.get()
+            if chunk is done:
+                remaining -= 1
+                continue
+            collected[name].append(chunk)
+            yield name, chunk
+        await asyncio.gather(*pumps)
+        
+        analysis_data = {name: "".join(chunks) for name, chunks in collected.items()}
+        analysis_data["timestamp"] = datetime.now().isoformat()
+        
+        report_agent = self.agents["report"]
+        prompt, _ = await asyncio.to_thread(report_agent._report_prompt, symbol, analysis_data)
+        async for chunk in report_agent.astream(prompt):
+            yield "final_report", chunk
 
 
 class AgentFactory:
-    """Factory class to create and manage agents"""
+    """Factory class to create and manage agents
+    
+    Agents are built once per process and reused, since each one holds a
+    Gemini client and registered tools that are expensive to construct.
+    """
+    
+    _instances: Dict[str, Any] = {}
+    _lock = threading.Lock()
+    _key_locks: Dict[str, threading.Lock] = {}
+    
+    @classmethod
+    def _get_or_create(cls, key: str, agent_class):
+        instance = cls._instances.get(key)
+        if instance is not None:
+            return instance
+        
+        # Lock per agent so different agents can be constructed in parallel
+        with cls._lock:
+            key_lock = cls._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            if key not in cls._instances:
+                cls._instances[key] = agent_class()
+            return cls._instances[key]
     
     @staticmethod
     def create_financial_agent():
-        return FinancialAnalysisAgent()
+        return AgentFactory._get_or_create("financial", FinancialAnalysisAgent)
     
     @staticmethod
     def create_research_agent():
-        return WebResearchAgent()
+        return AgentFactory._get_or_create("research", WebResearchAgent)
     
     @staticmethod
     def create_competitive_agent():
-        return CompetitiveIntelligenceAgent()
+        return AgentFactory._get_or_create("competitive", CompetitiveIntelligenceAgent)
     
     @staticmethod
     def create_technical_agent():
-        return TechnicalAnalysisAgent()
+        return AgentFactory._get_or_create("technical", TechnicalAnalysisAgent)
     
     @staticmethod
     def create_report_agent():
-        return ReportGenerationAgent()
+        return AgentFactory._get_or_create("report", ReportGenerationAgent)
     
     @staticmethod
     def create_all_agents():
         """Create all agents for use in workflows"""
         logger.info("Creating all agents")
-        return {
-            "financial": AgentFactory.create_financial_agent(),
-            "research": AgentFactory.create_research_agent(), 
-            "competitive": AgentFactory.create_competitive_agent(),
-            "technical": AgentFactory.create_technical_agent(),
-            "report": AgentFactory.create_report_agent()
-        }
\ No newline at end of file
+        creators = {
+            "financial": AgentFactory.create_financial_agent,
+            "research": AgentFactory.create_research_agent,
+            "competitive": AgentFactory.create_competitive_agent,
+            "technical": AgentFactory.create_technical_agent,
+            "report": AgentFactory.create_report_agent
+        }
+        if all(key in AgentFactory._instances for key in creators):
+            return {key: AgentFactory._instances[key] for key in creators}
+        
+        # First call: overlap the independent SDK and tool setup of each agent
+        with ThreadPoolExecutor(max_workers=len(creators)) as executor:
+            futures = {key: executor.submit(create) for key, create in creators.items()}
+            return {key: future.result() for key, future in futures.items()}
+    
+    @staticmethod
+    def warm_up():
+        """Build every agent and prime the shared Gemini connection with a trivial request"""
+        logger.info("Warming up agents")
+        try:
+            agents = AgentFactory.create_all_agents()
+            # All agents share one Gemini client, so a single round-trip primes the pool
+            agents["research"]._run("Reply with OK.")
+            logger.info("Agent warm-up complete")
+        except Exception as e:
+            logger.warning("Agent warm-up failed: %s", e)
+    
+    @staticmethod
+    def precompute(symbols: List[str]):
+        """Run the cacheable per-symbol analyses ahead of time so user requests hit the LLM cache"""
+        logger.info("Precomputing analyses for %s", ", ".join(symbols))
+        agents = AgentFactory.create_all_agents()
+        calls = (
+            agents["financial"].analyze_stock_async,
+            agents["technical"].technical_analysis_async,
+            agents["research"].research_company_news_async,
+            agents["competitive"].analyze_competitive_landscape_async
+        )
+        
+        async def run_all():
+            # The shared semaphore and rate limiter keep the fan-out within the Gemini quota
+            return await asyncio.gather(
+                *(call(symbol) for symbol in symbols for call in calls),
+                return_exceptions=True
+            )
+        
+        results = asyncio.run(run_all())
+        failures = [result for result in results if isinstance(result, Exception)]
+        if failures:
+            logger.warning("Precompute finished with %d failed analyses, first error: %s", len(failures), failures[0])
+        else:
+            logger.info("Precomputed %d analyses", len(results))
+    
+    @staticmethod
+    def schedule_precompute(symbols: List[str], interval: int):
+        """Precompute now and then every interval seconds, or once when interval is 0"""
+        while True:
+            try:
+                AgentFactory.precompute(symbols)
+            except Exception as e:
+                logger.warning("Precompute run failed: %s", e)
+            if interval <= 0:
+                return
+            time.sleep(interval)
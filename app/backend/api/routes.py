@@ -1,127 +1,240 @@
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, Response, stream_with_context
 from werkzeug.exceptions import BadRequest
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
+import atexit
 import logging
-import traceback
-from datetime import datetime
+import orjson
+import re
+import secrets
 import threading
-import uuid
-from io import BytesIO
+import time
+from datetime import datetime
+from urllib.parse import quote
 
 from workflows import WorkflowFactory
-from tools import PDFGenerationTool
+from agents import AgentFactory
+from api.schemas import (
+    AsyncStockRequest, ComparisonRequest, PdfContent, PdfRequest, PdfSections, QueryRequest,
+    ResearchRequest, StockRequest, ValidateSymbolsRequest, normalize_symbol, parse_request
+)
+from task_store import task_store
+from tasks import celery_app, celery_status
+from config import Config
+from tools import PDFGenerationTool, get_ticker_info
 
 api_bp = Blueprint('api', __name__)
 logger = logging.getLogger(__name__)
 
-# Store for tracking analysis status
-analysis_status = {}
+# Bounded pool for background analyses instead of one thread per request
+EXECUTOR = ThreadPoolExecutor(max_workers=Config.ASYNC_WORKERS, thread_name_prefix="analysis")
+atexit.register(EXECUTOR.shutdown, wait=False)
+# One slot per running or queued analysis; when none is free the request is shed
+_analysis_slots = threading.BoundedSemaphore(Config.ASYNC_WORKERS + Config.ASYNC_QUEUE_LIMIT)
+
+# Response timestamps only need second resolution, so format each second once
+_last_ts = [0, ""]
+
+def _now_iso():
+    """Current local time as an ISO string, reformatted at most once per second"""
+    now = int(time.time())
+    # A race here only means two threads format the same second
+    if now != _last_ts[0]:
+        _last_ts[:] = [now, datetime.fromtimestamp(now).isoformat()]
+    return _last_ts[1]
+
+# Workflows keep no per-request state, so each kind is built once per process
+@lru_cache(maxsize=1)
+def _investment_workflow():
+    return WorkflowFactory.create_investment_workflow()
+
+@lru_cache(maxsize=1)
+def _comparison_workflow():
+    return WorkflowFactory.create_comparison_workflow()
+
+@lru_cache(maxsize=1)
+def _research_workflow():
+    return WorkflowFactory.create_research_workflow()
+
+@lru_cache(maxsize=1)
+def _custom_workflow():
+    return WorkflowFactory.create_custom_workflow()
+
+# Stateless once its styles are built, so one instance serves every request
+_PDF_TOOL = PDFGenerationTool()
+
+def _dumps(obj):
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY, default=str)
+
+def _json(obj, status=200):
+    """Build a JSON response with orjson, skipping jsonify's str round-trip"""
+    return Response(_dumps(obj), status=status, mimetype='application/json')
+
+def _stream_json(response):
+    """Stream a response dict as chunked JSON, emitting its "result" one field at a time"""
+    def generate():
+        header = {key: value for key, value in response.items() if key != "result"}
+        result = response.get("result")
+        yield _dumps(header)[:-1] + b',"result":'
+        if isinstance(result, dict):
+            # Large analysis sections go out as they are encoded rather than in one blob
+            separator = b'{'
+            for key, value in result.items():
+                yield separator + _dumps(str(key)) + b':' + _dumps(value)
+                separator = b','
+            yield b'{}}' if separator == b'{' else b'}}'
+        else:
+            yield _dumps(result) + b'}'
+    
+    return Response(stream_with_context(generate()), mimetype='application/json', direct_passthrough=True)
+
+# Repeat requests for the same analysis within ANALYSIS_CACHE_TTL seconds skip the workflow
+_analysis_cache = TTLCache(maxsize=2048, ttl=Config.ANALYSIS_CACHE_TTL)
+_analysis_cache_lock = threading.Lock()
+
+def _cached_response(key):
+    """A cached response for key with a fresh timestamp, or None"""
+    with _analysis_cache_lock:
+        response = _analysis_cache.get(key)
+    return None if response is None else dict(response, timestamp=_now_iso(), cached=True)
+
+def _cache_response(key, response):
+    with _analysis_cache_lock:
+        _analysis_cache[key] = response
 
 @api_bp.route('/analyze/stock', methods=['POST'])
 def analyze_stock():
     try:
-        data = request.get_json()
-        
-        if not data or 'symbol' not in data:
-            raise BadRequest("Symbol is required")
+        data = parse_request(StockRequest)
+        symbol, analysis_type, defer_report = data.symbol, data.type, data.defer_report
         
-        symbol = data['symbol'].upper().strip()
-        analysis_type = data.get('type', 'quick')
-        
-        if not symbol or len(symbol) > 5:
-            raise BadRequest("Invalid symbol format")
+        # Deferred results carry a report job id, so only complete ones are shared
+        cache_key = None if defer_report else ("stock", symbol, analysis_type == 'quick')
+        if cache_key and (cached := _cached_response(cache_key)):
+            logger.info(f"Serving cached {analysis_type} analysis for {symbol}")
+            return _stream_json(cached)
         
         logger.info(f"Starting {analysis_type} analysis for {symbol}")
         
         if analysis_type == 'quick':
-            workflow = WorkflowFactory.create_investment_workflow()
+            workflow = _investment_workflow()
             result = workflow.quick_analysis(symbol)
             
             response = {
                 "symbol": symbol,
                 "analysis_type": "quick",
                 "result": result,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _now_iso(),
                 "status": "completed"
             }
         else:
-            workflow = WorkflowFactory.create_investment_workflow()
-            result = workflow.analyze_stock(symbol)
+            workflow = _investment_workflow()
+            result = workflow.analyze_stock(symbol, defer_report=defer_report)
             
             response = {
                 "symbol": symbol,
                 "analysis_type": "comprehensive",
                 "result": result,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _now_iso(),
                 "status": "completed"
             }
         
+        if cache_key:
+            _cache_response(cache_key, response)
+        
         logger.info(f"Analysis completed for {symbol}")
-        return jsonify(response)
+        return _stream_json(response)
         
     except BadRequest as e:
         logger.warning(f"Bad request: {e}")
-        return jsonify({"error": str(e)}), 400
+        return _json({"error": str(e)}, 400)
     except Exception as e:
-        logger.error(f"Analysis failed: {e}")
-        logger.error(traceback.format_exc())
-        return jsonify({"error": "Analysis failed", "details": str(e)}), 500
+        logger.exception("Analysis failed")
+        return _json({"error": "Analysis failed", "details": str(e)}, 500)
+
+def _sse(event, data):
+    """Encode one Server-Sent Event"""
+    return b"event: " + event.encode() + b"\ndata: " + _dumps(data) + b"\n\n"
+
+@api_bp.route('/analyze/stock/stream', methods=['POST'])
+def analyze_stock_stream():
+    """Comprehensive analysis as Server-Sent Events, so clients see each section as it is written"""
+    try:
+        symbol = parse_request(StockRequest).symbol
+    except BadRequest as e:
+        logger.warning(f"Bad request: {e}")
+        return _json({"error": str(e)}, 400)
+    
+    logger.info(f"Starting streamed analysis for {symbol}")
+    
+    def generate():
+        try:
+            for section, chunk in _investment_workflow().stream_analysis(symbol):
+                yield _sse("progress", {"section": section, "chunk": chunk})
+            yield _sse("complete", {
+                "symbol": symbol,
+                "analysis_type": "comprehensive",
+                "timestamp": _now_iso(),
+                "status": "completed"
+            })
+            logger.info(f"Streamed analysis completed for {symbol}")
+        except Exception as e:
+            logger.exception("Streamed analysis failed")
+            yield _sse("error", {"error": "Analysis failed", "details": str(e)})
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        # Keep proxies from buffering the stream until it ends
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        direct_passthrough=True
+    )
 
 @api_bp.route('/analyze/comparison', methods=['POST'])
 def compare_stocks():
     try:
-        data = request.get_json()
+        symbols = parse_request(ComparisonRequest).symbols
         
-        if not data or 'symbols' not in data:
-            raise BadRequest("Symbols list is required")
-        
-        symbols = [s.upper().strip() for s in data['symbols'] if s.strip()]
-        
-        if len(symbols) < 2:
-            raise BadRequest("At least 2 symbols required for comparison")
-        
-        if len(symbols) > 5:
-            raise BadRequest("Maximum 5 symbols allowed for comparison")
+        cache_key = ("comparison", tuple(symbols))
+        if cached := _cached_response(cache_key):
+            logger.info(f"Serving cached comparison for {symbols}")
+            return _stream_json(cached)
         
         logger.info(f"Starting comparison analysis for {symbols}")
         
-        workflow = WorkflowFactory.create_comparison_workflow()
+        workflow = _comparison_workflow()
         result = workflow.compare_stocks(symbols)
         
         response = {
             "symbols": symbols,
             "analysis_type": "comparison",
             "result": result,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
             "status": "completed"
         }
         
+        _cache_response(cache_key, response)
+        
         logger.info(f"Comparison completed for {symbols}")
-        return jsonify(response)
+        return _stream_json(response)
         
     except BadRequest as e:
         logger.warning(f"Bad request: {e}")
-        return jsonify({"error": str(e)}), 400
+        return _json({"error": str(e)}, 400)
     except Exception as e:
-        logger.error(f"Comparison failed: {e}")
-        logger.error(traceback.format_exc())
-        return jsonify({"error": "Comparison failed", "details": str(e)}), 500
+        logger.exception("Comparison failed")
+        return _json({"error": "Comparison failed", "details": str(e)}, 500)
 
 @api_bp.route('/analyze/research', methods=['POST'])
 def market_research():
     try:
-        data = request.get_json()
-        
-        if not data or 'topic' not in data:
-            raise BadRequest("Research topic is required")
-        
-        topic = data['topic'].strip()
-        
-        if not topic:
-            raise BadRequest("Topic cannot be empty")
+        topic = parse_request(ResearchRequest).topic
         
         logger.info(f"Starting market research for: {topic}")
         
-        workflow = WorkflowFactory.create_research_workflow()
+        workflow = _research_workflow()
         result = workflow.research_market_topic(topic)
         
         # Ensure we're returning the right structure
@@ -136,224 +249,238 @@ def market_research():
             "topic": topic,
             "analysis_type": "market_research",
             "result": final_result,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
             "status": "completed"
         }
         
         logger.info(f"Market research completed for: {topic}")
-        return jsonify(response)
+        return _stream_json(response)
         
     except BadRequest as e:
         logger.warning(f"Bad request: {e}")
-        return jsonify({"error": str(e)}), 400
+        return _json({"error": str(e)}, 400)
     except Exception as e:
-        logger.error(f"Market research failed: {e}")
-        logger.error(traceback.format_exc())
-        return jsonify({"error": "Market research failed", "details": str(e)}), 500
+        logger.exception("Market research failed")
+        return _json({"error": "Market research failed", "details": str(e)}, 500)
 
 @api_bp.route('/analyze/query', methods=['POST'])
 def custom_query():
     try:
-        data = request.get_json()
-        
-        if not data or 'query' not in data:
-            raise BadRequest("Query is required")
-        
-        query = data['query'].strip()
-        
-        if not query:
-            raise BadRequest("Query cannot be empty")
+        query = parse_request(QueryRequest).query
         
         logger.info(f"Processing custom query: {query[:100]}...")
         
-        workflow = WorkflowFactory.create_custom_workflow()
+        workflow = _custom_workflow()
         result = workflow.process_query(query)
         
         response = {
             "query": query,
             "analysis_type": "custom_query",
             "result": result,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
             "status": "completed"
         }
         
         logger.info("Custom query processing completed")
-        return jsonify(response)
+        return _json(response)
         
     except BadRequest as e:
         logger.warning(f"Bad request: {e}")
-        return jsonify({"error": str(e)}), 400
+        return _json({"error": str(e)}, 400)
     except Exception as e:
-        logger.error(f"Custom query failed: {e}")
-        logger.error(traceback.format_exc())
-        return jsonify({"error": "Custom query failed", "details": str(e)}), 500
+        logger.exception("Custom query failed")
+        return _json({"error": "Custom query failed", "details": str(e)}, 500)
+
+# (result key, heading) pairs, in the order they appear in the PDF
+_COMPREHENSIVE_SECTIONS = (
+    ('final_report', 'Final Report'),
+    ('financial_analysis', 'Financial Analysis'),
+    ('technical_analysis', 'Technical Analysis'),
+    ('news_analysis', 'News Analysis'),
+    ('competitive_analysis', 'Competitive Analysis')
+)
+_COMPARISON_SECTIONS = (
+    ('comparison_report', 'Comparison Report'),
+    ('financial_comparison', 'Financial Comparison'),
+    ('technical_comparison', 'Technical Comparison')
+)
+_SECTION_SEPARATOR = "\n\n---\n\n"
+
+# Filenames keep letters, digits, spaces, hyphens and underscores; one regex pass drops the rest
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^\w \-]+').sub
+
+_NO_SECTIONS = PdfSections()
+
+def _chart_section(symbols):
+    """Price chart placeholders for the valid symbols, drawn as images by the PDF tool"""
+    tokens = [f"![chart:{symbol}]" for symbol, valid in map(normalize_symbol, symbols) if valid]
+    return "# Price Charts\n" + "\n".join(tokens) if tokens else None
+
+def _sections(result, table):
+    """Markdown sections for each non-empty result field in table"""
+    return [f"# {heading}\n{text}" for key, heading in table if (text := getattr(result, key))]
 
 @api_bp.route('/download/pdf', methods=['POST'])
 def download_pdf():
     try:
-        data = request.get_json()
-        
-        if not data or 'content' not in data or 'title' not in data:
-            raise BadRequest("Content and title are required")
-        
-        content = data['content']
-        title = data['title']
-        
-        if not content or not title:
-            raise BadRequest("Content and title cannot be empty")
+        data = parse_request(PdfRequest)
+        content, title = data.content, data.title
         
         logger.info(f"Generating PDF for: {title}")
         
         # Extract content based on type
         markdown_content = ""
         
-        if isinstance(content, dict):
-            if content.get('analysis_type') == 'comprehensive':
-                result = content.get('result', {})
-                # Combine all comprehensive analysis sections
-                sections = []
-                if result.get('final_report'):
-                    sections.append("# Final Report\n" + result.get('final_report'))
-                if result.get('financial_analysis'):
-                    sections.append("# Financial Analysis\n" + result.get('financial_analysis'))
-                if result.get('technical_analysis'):
-                    sections.append("# Technical Analysis\n" + result.get('technical_analysis'))
-                if result.get('news_analysis'):
-                    sections.append("# News Analysis\n" + result.get('news_analysis'))
-                if result.get('competitive_analysis'):
-                    sections.append("# Competitive Analysis\n" + result.get('competitive_analysis'))
-                
-                markdown_content = "\n\n---\n\n".join(sections)
+        if isinstance(content, PdfContent):
+            result = content.result
+            # Text results have no sections
+            result_sections = result if isinstance(result, PdfSections) else _NO_SECTIONS
+            
+            if content.analysis_type == 'comprehensive':
+                # Combine all comprehensive analysis sections, charting the symbol after the report
+                sections = _sections(result_sections, _COMPREHENSIVE_SECTIONS)
+                if sections and content.symbol and (charts := _chart_section((content.symbol,))):
+                    sections.insert(1, charts)
+                markdown_content = _SECTION_SEPARATOR.join(sections)
                 
-            elif content.get('analysis_type') == 'market_research':
-                result = content.get('result', {})
-                if isinstance(result, dict):
-                    markdown_content = result.get('research_report', '')
+            elif content.analysis_type == 'market_research':
+                if isinstance(result, str):
+                    markdown_content = result
                 else:
-                    markdown_content = str(result)
+                    markdown_content = result_sections.research_report or ''
                     
-            elif content.get('analysis_type') == 'comparison':
-                result = content.get('result', {})
-                # Combine all comparison sections
-                sections = []
+            elif content.analysis_type == 'comparison':
+                # Combine all comparison sections, charting each symbol after the report
+                sections = _sections(result_sections, _COMPARISON_SECTIONS)
+                if sections and content.symbols and (charts := _chart_section(content.symbols[:5])):
+                    sections.insert(1, charts)
                 
-                if result.get('comparison_report'):
-                    sections.append("# Comparison Report\n" + result.get('comparison_report'))
-                    
-                if result.get('financial_comparison'):
-                    sections.append("# Financial Comparison\n" + result.get('financial_comparison'))
-                    
-                if result.get('technical_comparison'):
-                    sections.append("# Technical Comparison\n" + result.get('technical_comparison'))
-                    
-                if result.get('competitive_analyses'):
-                    sections.append("# Competitive Analysis")
-                    competitive_analyses = result.get('competitive_analyses', {})
-                    for symbol, analysis in competitive_analyses.items():
-                        sections.append(f"## {symbol} Competitive Analysis\n{analysis}")
+                if competitive_analyses := result_sections.competitive_analyses:
+                    sections = chain(
+                        sections,
+                        ("# Competitive Analysis",),
+                        (f"## {symbol} Competitive Analysis\n{analysis}" for symbol, analysis in competitive_analyses.items())
+                    )
                 
-                markdown_content = "\n\n---\n\n".join(sections)
+                markdown_content = _SECTION_SEPARATOR.join(sections)
                 
             else:
-                markdown_content = content.get('result', '')
+                markdown_content = result if isinstance(result, str) else ''
         else:
-            markdown_content = str(content)
+            markdown_content = content
         
         if not markdown_content:
             raise BadRequest("No content available for PDF generation")
         
         # Generate PDF
-        pdf_tool = PDFGenerationTool()
-        pdf_bytes = pdf_tool.generate_pdf(markdown_content, title)
-        
-        # Create BytesIO object for sending file
-        pdf_buffer = BytesIO(pdf_bytes)
-        pdf_buffer.seek(0)
+        pdf_bytes = _PDF_TOOL.generate_pdf(markdown_content, title)
         
         # Generate filename
-        safe_title = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_')).rstrip()
-        filename = f"{safe_title}_{datetime.now().strftime('%Y%m%d')}.pdf"
+        safe_title = _UNSAFE_FILENAME_CHARS('', title).rstrip()
+        # YYYYMMDD from the cached ISO timestamp instead of another strftime
+        filename = f"{safe_title}_{_now_iso()[:10].replace('-', '')}.pdf"
         
         logger.info(f"PDF generated successfully: {filename}")
         
-        return send_file(
-            pdf_buffer,
-            as_attachment=True,
-            download_name=filename,
-            mimetype='application/pdf'
-        )
+        # The PDF is already in memory, so hand it over as one body with a known length
+        # rather than streaming it back out of a BytesIO in small chunks
+        if filename.isascii():
+            disposition = f'attachment; filename="{filename}"'
+        else:
+            disposition = f"attachment; filename*=UTF-8''{quote(filename)}"
+        return Response(pdf_bytes, mimetype='application/pdf', headers={"Content-Disposition": disposition})
         
     except BadRequest as e:
         logger.warning(f"Bad request: {e}")
-        return jsonify({"error": str(e)}), 400
+        return _json({"error": str(e)}, 400)
     except Exception as e:
-        logger.error(f"PDF generation failed: {e}")
-        logger.error(traceback.format_exc())
-        return jsonify({"error": "PDF generation failed", "details": str(e)}), 500
+        logger.exception("PDF generation failed")
+        return _json({"error": "PDF generation failed", "details": str(e)}, 500)
+
+def _finish_task(future):
+    """Free the task's analysis slot and log tasks that died outside their own error handling"""
+    _analysis_slots.release()
+    if not future.cancelled() and future.exception() is not None:
+        logger.error(f"Background analysis crashed: {future.exception()}")
 
 @api_bp.route('/analyze/async/stock', methods=['POST'])
 def analyze_stock_async():
     try:
-        data = request.get_json()
-        
-        if not data or 'symbol' not in data:
-            raise BadRequest("Symbol is required")
-        
-        symbol = data['symbol'].upper().strip()
-        analysis_type = data.get('type', 'comprehensive')
+        data = parse_request(AsyncStockRequest)
+        symbol, analysis_type = data.symbol, data.type
+        
+        # Hand the analysis to a Celery worker when a broker is configured
+        if celery_app is not None:
+            task_id = celery_app.send_task("intellimarket.run_stock_analysis", args=[symbol, analysis_type]).id
+            task_store.set(task_id, {
+                "status": "started",
+                "symbol": symbol,
+                "analysis_type": analysis_type,
+                "started_at": _now_iso(),
+                "progress": 0
+            })
+            return _json({
+                "task_id": task_id,
+                "status": "started",
+                "message": f"Analysis started for {symbol}"
+            })
         
-        if not symbol or len(symbol) > 5:
-            raise BadRequest("Invalid symbol format")
+        # Shed load instead of queueing work that would finish long after clients give up
+        if not _analysis_slots.acquire(blocking=False):
+            logger.warning("Async analysis queue is full, rejecting request")
+            return _json({"error": "Server busy, try again later"}, 503)
         
         # Generate unique task ID
-        task_id = str(uuid.uuid4())
+        task_id = secrets.token_hex(16)
         
         # Initialize status
-        analysis_status[task_id] = {
+        task_store.set(task_id, {
             "status": "started",
             "symbol": symbol,
             "analysis_type": analysis_type,
-            "started_at": datetime.now().isoformat(),
+            "started_at": _now_iso(),
             "progress": 0
-        }
+        })
         
         # Start analysis in background thread
         def run_analysis():
             try:
                 logger.info(f"Starting async {analysis_type} analysis for {symbol}")
                 
-                analysis_status[task_id]["status"] = "processing"
-                analysis_status[task_id]["progress"] = 25
+                task_store.set(task_id, {"status": "processing", "progress": 25})
                 
-                workflow = WorkflowFactory.create_investment_workflow()
+                workflow = _investment_workflow()
                 
                 if analysis_type == 'quick':
                     result = workflow.quick_analysis(symbol)
                 else:
                     result = workflow.analyze_stock(symbol)
                 
-                analysis_status[task_id].update({
+                task_store.set(task_id, {
                     "status": "completed",
                     "progress": 100,
                     "result": result,
-                    "completed_at": datetime.now().isoformat()
+                    "completed_at": _now_iso()
                 })
                 
                 logger.info(f"Async analysis completed for {symbol}")
                 
             except Exception as e:
                 logger.error(f"Async analysis failed for {symbol}: {e}")
-                analysis_status[task_id].update({
+                task_store.set(task_id, {
                     "status": "failed",
                     "error": str(e),
-                    "failed_at": datetime.now().isoformat()
+                    "failed_at": _now_iso()
                 })
         
-        thread = threading.Thread(target=run_analysis)
-        thread.daemon = True
-        thread.start()
+        try:
+            future = EXECUTOR.submit(run_analysis)
+        except Exception:
+            _analysis_slots.release()
+            raise
+        future.add_done_callback(_finish_task)
         
-        return jsonify({
+        return _json({
             "task_id": task_id,
             "status": "started",
             "message": f"Analysis started for {symbol}"
@@ -361,76 +488,136 @@ def analyze_stock_async():
         
     except BadRequest as e:
         logger.warning(f"Bad request: {e}")
-        return jsonify({"error": str(e)}), 400
+        return _json({"error": str(e)}, 400)
     except Exception as e:
         logger.error(f"Failed to start async analysis: {e}")
-        return jsonify({"error": "Failed to start analysis", "details": str(e)}), 500
+        return _json({"error": "Failed to start analysis", "details": str(e)}, 500)
 
 @api_bp.route('/status/<task_id>', methods=['GET'])
 def get_analysis_status(task_id):
     try:
-        if task_id not in analysis_status:
-            return jsonify({"error": "Task not found"}), 404
+        # Tasks expire TASK_STATUS_TTL seconds after their last update
+        status_data = task_store.get(task_id)
         
-        status_data = analysis_status[task_id].copy()
+        # Queued tasks report progress through the Celery result backend, which every
+        # worker can read even when the task record was kept by another one
+        if celery_app is not None:
+            queued = celery_status(task_id)
+            if queued:
+                status_data = {**(status_data or {}), **queued}
         
-        # Clean up completed/failed tasks after 1 hour
-        if status_data.get("status") in ["completed", "failed"]:
-            completed_time = status_data.get("completed_at") or status_data.get("failed_at")
-            if completed_time:
-                from datetime import datetime, timedelta
-                completed_dt = datetime.fromisoformat(completed_time)
-                if datetime.now() - completed_dt > timedelta(hours=1):
-                    del analysis_status[task_id]
+        if status_data is None:
+            return _json({"error": "Task not found"}, 404)
         
-        return jsonify(status_data)
+        return _json(status_data)
         
     except Exception as e:
         logger.error(f"Failed to get status for task {task_id}: {e}")
-        return jsonify({"error": "Failed to get status"}), 500
+        return _json({"error": "Failed to get status"}, 500)
 
-@api_bp.route('/validate/symbol/<symbol>', methods=['GET'])
-def validate_symbol(symbol):
+@api_bp.route('/report/<job_id>', methods=['GET'])
+def get_report(job_id):
+    try:
+        job = AgentFactory.create_report_agent().get_report(job_id)
+        
+        if job is None:
+            return _json({"error": "Report job not found"}, 404)
+        
+        return _json(job)
+        
+    except Exception as e:
+        logger.error(f"Failed to get report job {job_id}: {e}")
+        return _json({"error": "Failed to get report"}, 500)
+
+# Names and sectors change at most daily; unknown symbols are remembered for an hour
+# so scans repeating garbage tickers do not hit Yahoo Finance each time
+_valid_symbol_cache = TTLCache(maxsize=4096, ttl=86400)
+_invalid_symbol_cache = TTLCache(maxsize=4096, ttl=3600)
+_symbol_cache_lock = threading.Lock()
+
+def _validate_one(symbol):
+    """Validate one raw symbol, returning the response body for it"""
     try:
-        symbol = symbol.upper().strip()
+        symbol, valid = normalize_symbol(symbol)
         
         # Basic validation
-        if not symbol or len(symbol) > 5 or not symbol.isalpha():
-            return jsonify({"valid": False, "reason": "Invalid format"})
+        if not valid:
+            return {"valid": False, "reason": "Invalid format"}
+        
+        with _symbol_cache_lock:
+            cached = _valid_symbol_cache.get(symbol) or _invalid_symbol_cache.get(symbol)
+        if cached is not None:
+            return cached
         
         # Try to fetch basic data to verify symbol exists
-        import yfinance as yf
-        ticker = yf.Ticker(symbol)
-        info = ticker.info
+        info = get_ticker_info(symbol)
         
         if info.get("symbol") == symbol or info.get("shortName"):
-            return jsonify({
+            result = {
                 "valid": True,
                 "symbol": symbol,
                 "name": info.get("shortName", "Unknown"),
                 "sector": info.get("sector"),
                 "industry": info.get("industry")
-            })
+            }
+            with _symbol_cache_lock:
+                _valid_symbol_cache[symbol] = result
         else:
-            return jsonify({"valid": False, "reason": "Symbol not found"})
+            result = {"valid": False, "reason": "Symbol not found"}
+            with _symbol_cache_lock:
+                _invalid_symbol_cache[symbol] = result
+        return result
             
     except Exception as e:
         logger.warning(f"Symbol validation failed for {symbol}: {e}")
-        return jsonify({"valid": False, "reason": "Validation failed"})
+        return {"valid": False, "reason": "Validation failed"}
+
+def _validate_batch(symbols):
+    """Validate raw symbols side by side, looking each distinct symbol up once"""
+    keys = [normalize_symbol(s)[0] if isinstance(s, str) else None for s in symbols]
+    distinct = list(dict.fromkeys(key for key in keys if key is not None))
+    
+    # Each lookup is a network round-trip, so probe the symbols side by side
+    found = {}
+    if distinct:
+        with ThreadPoolExecutor(max_workers=min(8, len(distinct))) as executor:
+            found = dict(zip(distinct, executor.map(_validate_one, distinct)))
+    
+    return [found[key] if key is not None else _validate_one(raw) for key, raw in zip(keys, symbols)]
+
+@api_bp.route('/validate/symbol/<symbol>', methods=['GET'])
+def validate_symbol(symbol):
+    return _json(_validate_one(symbol))
+
+@api_bp.route('/validate/symbols', methods=['POST'])
+def validate_symbols_batch():
+    try:
+        symbols = parse_request(ValidateSymbolsRequest).symbols
+        
+        if not symbols:
+            return _json({"results": []})
+        
+        return _json({"results": _validate_batch(symbols)})
+        
+    except BadRequest as e:
+        logger.warning(f"Bad request: {e}")
+        return _json({"error": str(e)}, 400)
+
+# Everything but the timestamp is static, so it is serialized once at import
+_SYSTEM_INFO_PREFIX = orjson.dumps({
+    "service": "IntelliMarket API",
+    "version": "1.0.0",
+    "status": "operational",
+    "features": [
+        "Single stock analysis",
+        "Stock comparison",
+        "Market research", 
+        "Custom queries",
+        "Async processing",
+        "PDF report generation"
+    ]
+})[:-1] + b',"timestamp":"'
 
 @api_bp.route('/system/info', methods=['GET'])
 def system_info():
-    return jsonify({
-        "service": "IntelliMarket API",
-        "version": "1.0.0",
-        "status": "operational",
-        "features": [
-            "Single stock analysis",
-            "Stock comparison",
-            "Market research", 
-            "Custom queries",
-            "Async processing",
-            "PDF report generation"
-        ],
-        "timestamp": datetime.now().isoformat()
-    })
\ No newline at end of file
+    return Response(_SYSTEM_INFO_PREFIX + _now_iso().encode() + b'"}', mimetype='application/json')
\ No newline at end of file
@@ -0,0 +1,150 @@
+from typing import Any, ClassVar, Dict, List, Optional, Union
+from functools import lru_cache
+from flask import request
+from werkzeug.exceptions import BadRequest
+import msgspec
+import re
+
+# Tickers are 1-5 characters: letters, plus . or - for share classes (BRK.B, BF-B)
+_SYM_RE = re.compile(r'\A[A-Z][A-Z.\-]{0,4}\Z').match
+
+# Longer raw input cannot hold a ticker even with surrounding whitespace
+_MAX_RAW_SYMBOL_LEN = 10
+
+@lru_cache(maxsize=8192)
+def _normalize_symbol(raw):
+    symbol = raw.upper().strip()
+    return symbol, _SYM_RE(symbol) is not None
+
+def normalize_symbol(raw):
+    """Return (normalized symbol, is valid) for a raw user-supplied symbol"""
+    # Keep arbitrary long strings out of the cache
+    if len(raw) > _MAX_RAW_SYMBOL_LEN:
+        return raw.upper().strip(), False
+    return _normalize_symbol(raw)
+
+
+class StockRequest(msgspec.Struct):
+    """Body of /analyze/stock"""
+    required_message: ClassVar[str] = "Symbol is required"
+    
+    symbol: str
+    type: str = 'quick'
+    # Return once the upstream agents finish and let the client poll /report/<job_id>
+    defer_report: bool = False
+    
+    def __post_init__(self):
+        self.symbol, valid = normalize_symbol(self.symbol)
+        if not valid:
+            raise BadRequest("Invalid symbol format")
+
+
+class AsyncStockRequest(StockRequest):
+    """Body of /analyze/async/stock"""
+    type: str = 'comprehensive'
+
+
+class ComparisonRequest(msgspec.Struct):
+    """Body of /analyze/comparison"""
+    required_message: ClassVar[str] = "Symbols list is required"
+    
+    symbols: List[str]
+    
+    def __post_init__(self):
+        normalized = [normalize_symbol(s) for s in self.symbols if s.strip()]
+        self.symbols = [symbol for symbol, _ in normalized]
+        
+        if not all(valid for _, valid in normalized):
+            raise BadRequest("Invalid symbol format")
+        
+        if len(self.symbols) < 2:
+            raise BadRequest("At least 2 symbols required for comparison")
+        
+        if len(self.symbols) > 5:
+            raise BadRequest("Maximum 5 symbols allowed for comparison")
+
+
+class ResearchRequest(msgspec.Struct):
+    """Body of /analyze/research"""
+    required_message: ClassVar[str] = "Research topic is required"
+    
+    topic: str
+    
+    def __post_init__(self):
+        self.topic = self.topic.strip()
+        if not self.topic:
+            raise BadRequest("Topic cannot be empty")
+
+
+class QueryRequest(msgspec.Struct):
+    """Body of /analyze/query"""
+    required_message: ClassVar[str] = "Query is required"
+    
+    query: str
+    
+    def __post_init__(self):
+        self.query = self.query.strip()
+        if not self.query:
+            raise BadRequest("Query cannot be empty")
+
+
+class PdfSections(msgspec.Struct):
+    """Report sections of an analysis result; any other field is skipped without being decoded"""
+    final_report: Optional[str] = None
+    financial_analysis: Optional[str] = None
+    technical_analysis: Optional[str] = None
+    news_analysis: Optional[str] = None
+    competitive_analysis: Optional[str] = None
+    comparison_report: Optional[str] = None
+    financial_comparison: Optional[str] = None
+    technical_comparison: Optional[str] = None
+    competitive_analyses: Optional[Dict[str, str]] = None
+    research_report: Optional[str] = None
+
+
+class PdfContent(msgspec.Struct):
+    """An analysis response sent back for rendering"""
+    analysis_type: Optional[str] = None
+    # The analysed symbol(s), whose price charts are drawn into the PDF
+    symbol: Optional[str] = None
+    symbols: Optional[List[str]] = None
+    result: Union[PdfSections, str, None] = None
+
+
+class PdfRequest(msgspec.Struct):
+    """Body of /download/pdf"""
+    required_message: ClassVar[str] = "Content and title are required"
+    
+    # Only the fields the PDF renders are decoded from the (often multi-MB) analysis body
+    content: Union[PdfContent, str]
+    title: str
+    
+    def __post_init__(self):
+        if not self.content or not self.title:
+            raise BadRequest("Content and title cannot be empty")
+
+
+class ValidateSymbolsRequest(msgspec.Struct):
+    """Body of /validate/symbols"""
+    required_message: ClassVar[str] = "Symbols list is required"
+    
+    symbols: List[Any]
+    
+    def __post_init__(self):
+        if len(self.symbols) > 20:
+            raise BadRequest("Maximum 20 symbols allowed per validation")
+
+
+def parse_request(model):
+    """Decode and validate the request body as model in one pass, raising BadRequest on failure"""
+    try:
+        # msgspec decodes straight into the struct, skipping the dict built by get_json
+        return msgspec.json.decode(request.get_data(cache=False), type=model)
+    except msgspec.ValidationError as e:
+        message = str(e)
+        # Missing fields and non-object bodies get the endpoint's own message
+        if "missing required field" in message or " - at `" not in message:
+            raise BadRequest(model.required_message)
+        raise BadRequest(message)
+    except msgspec.DecodeError:
+        raise BadRequest("Request body must be valid JSON")
@@ -1,11 +1,49 @@
 from flask import Flask
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
 from config import Config
 import logging
+import orjson
+import threading
 
-def create_app():
+class ORJSONProvider(JSONProvider):
+    """Serve jsonify and request.get_json through orjson instead of the stdlib encoder"""
+    
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=self.option, default=str).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+def start_background_tasks(precompute=True):
+    """Start agent warm-up and market data prewarm threads, plus symbol precompute when precompute is set"""
+    from agents import AgentFactory
+    
+    # Warm up agents off the request path so the first user call skips cold start
+    if Config.WARM_UP_AGENTS:
+        threading.Thread(target=AgentFactory.warm_up, name="agent-warm-up", daemon=True).start()
+    
+    # Fill the market data cache so the first comparisons skip the Yahoo round trips
+    if Config.PREWARM_MARKET_DATA:
+        from tools import prewarm_market_data
+        threading.Thread(target=prewarm_market_data, name="market-data-prewarm", daemon=True).start()
+    
+    # Keep analyses of frequently requested symbols in the LLM cache; multi-worker servers
+    # pass precompute only when that cache is shared (see gunicorn.conf.py)
+    if precompute and Config.PRECOMPUTE_SYMBOLS:
+        threading.Thread(
+            target=AgentFactory.schedule_precompute,
+            args=(Config.PRECOMPUTE_SYMBOLS, Config.PRECOMPUTE_INTERVAL),
+            name="agent-precompute",
+            daemon=True
+        ).start()
+
+def create_app(background_tasks=True):
     app = Flask(__name__)
     app.config.from_object(Config)
+    app.json = ORJSONProvider(app)
     
     # Setup CORS
     CORS(app, origins=Config.CORS_ORIGINS)
@@ -21,10 +59,14 @@ def create_app():
         logger.error(f"Configuration error: {e}")
         raise
     
-    # Register blueprints
+    # Register blueprints; importing the routes also loads the agents, tools and yfinance
+    # here at startup instead of on the first request
     from api.routes import api_bp
     app.register_blueprint(api_bp, url_prefix='/api')
     
+    if background_tasks:
+        start_background_tasks()
+    
     @app.route('/health')
     def health_check():
         return {"status": "healthy", "service": "IntelliMarket API"}
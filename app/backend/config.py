@@ -10,6 +10,8 @@ class Config:
     
     # Model Configuration
     GEMINI_MODEL = "gemini-2.5-flash"
+    # Requests-per-minute budget shared by all agents (0 disables the limiter)
+    GEMINI_RPM = int(os.getenv("GEMINI_RPM", 60))
     
     # Flask Configuration
     SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
@@ -23,6 +25,47 @@ class Config:
     # Agent Configuration
     MAX_RETRIES = 3
     TIMEOUT = 300
+    AGENT_MAX_CONCURRENCY = int(os.getenv("AGENT_MAX_CONCURRENCY", 4))
+    # Build agents and prime the Gemini connection in the background at startup
+    WARM_UP_AGENTS = os.getenv("WARM_UP_AGENTS", "False").lower() == "true"
+    # Symbols packed into a single prompt by the *_batched agent methods
+    AGENT_BATCH_SIZE = int(os.getenv("AGENT_BATCH_SIZE", 8))
+    
+    # LLM Response Cache Configuration
+    LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", 3600))
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 1024))
+    # Symbols analysed ahead of time so user requests hit the cache (empty disables);
+    # with several gunicorn workers this needs REDIS_URL, since an in-memory cache warms one worker
+    PRECOMPUTE_SYMBOLS = [s.strip().upper() for s in os.getenv("PRECOMPUTE_SYMBOLS", "").split(",") if s.strip()]
+    # Seconds between precompute runs; keep below LLM_CACHE_TTL (0 runs once at startup)
+    PRECOMPUTE_INTERVAL = int(os.getenv("PRECOMPUTE_INTERVAL", 3000))
+    
+    # Market Data Cache Configuration (yfinance lookups)
+    MARKET_DATA_CACHE_TTL = int(os.getenv("MARKET_DATA_CACHE_TTL", 60))
+    MARKET_DATA_CACHE_SIZE = int(os.getenv("MARKET_DATA_CACHE_SIZE", 4096))
+    # Load the sector peer symbols into the market data cache at startup
+    PREWARM_MARKET_DATA = os.getenv("PREWARM_MARKET_DATA", "False").lower() == "true"
+    # Seconds DuckDuckGo news and web search results are reused
+    SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", 300))
+    
+    # Seconds a finished /analyze/stock or /analyze/comparison response is reused
+    ANALYSIS_CACHE_TTL = int(os.getenv("ANALYSIS_CACHE_TTL", 60))
+    
+    # Redis Configuration (optional, enables shared caching across workers)
+    REDIS_URL = os.getenv("REDIS_URL")
+    REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 64))
+    
+    # Celery Configuration (optional, runs background analyses on separate workers)
+    CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL")
+    CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND")
+    
+    # Seconds a background task's status is kept after its last update
+    TASK_STATUS_TTL = int(os.getenv("TASK_STATUS_TTL", 3600))
+    # Most task statuses kept in memory when Redis is not configured
+    TASK_STORE_MAX_ENTRIES = int(os.getenv("TASK_STORE_MAX_ENTRIES", 10000))
+    # Worker threads for /analyze/async/stock and the queued tasks allowed before returning 503
+    ASYNC_WORKERS = int(os.getenv("ASYNC_WORKERS", 16))
+    ASYNC_QUEUE_LIMIT = int(os.getenv("ASYNC_QUEUE_LIMIT", 64))
     
     # Logging Configuration
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -0,0 +1,70 @@
+import fcntl
+import os
+import re
+import tempfile
+
+# Gunicorn settings for the API, used as: gunicorn -c backend/gunicorn.conf.py wsgi:application
+
+# Backend modules import each other as top-level modules (from config import Config)
+pythonpath = os.path.dirname(os.path.abspath(__file__))
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("GUNICORN_WORKERS", 4))
+
+# Every handler waits on yfinance, search or Gemini over the network, so each worker
+# serves several requests on real threads. Analyses run their agents through
+# asyncio.run, which needs an OS thread of its own; gevent's greenlets share one
+# thread and would see another request's event loop as already running.
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.getenv("GUNICORN_THREADS", 16))
+
+# Build the app once in the master so imports, agents and workflows are shared
+# copy-on-write by every worker
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+
+# Keep connections open across the frontend's /status polling
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 75))
+
+# Comprehensive analyses run several model calls back to back
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 300))
+
+
+# With a Redis-backed LLM cache, one worker per deployment runs the precompute for all
+# of them, so the Gemini quota is not spent once per worker; the lock is released with
+# its holder, and the worker spawned to replace it takes over
+_PRECOMPUTE_LOCK_PATH = os.path.join(
+    tempfile.gettempdir(),
+    "intellimarket-precompute-" + re.sub(r"[^A-Za-z0-9]", "_", bind) + ".lock"
+)
+_precompute_lock = None
+
+
+def _claim_precompute():
+    """Take the precompute lock without blocking; True when this worker now holds it"""
+    global _precompute_lock
+    lock_file = open(_PRECOMPUTE_LOCK_PATH, "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+    # Kept open for the life of the worker; closing it would release the lock
+    _precompute_lock = lock_file
+    return True
+
+
+def post_worker_init(worker):
+    # Warm-up and prewarm fill this worker's own caches, so every worker runs them
+    # after the fork; precompute runs only in the worker holding the lock
+    from app import start_background_tasks
+    from config import Config
+    from llm_cache import llm_cache
+    
+    precompute = False
+    if Config.PRECOMPUTE_SYMBOLS:
+        if llm_cache.shared:
+            precompute = _claim_precompute()
+        else:
+            # An in-memory cache would only warm the one worker that ran the precompute
+            worker.log.warning("PRECOMPUTE_SYMBOLS needs REDIS_URL under gunicorn; skipping precompute")
+    start_background_tasks(precompute=precompute)
@@ -0,0 +1,64 @@
+import math
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _jit(func):
+    """Compile func with numba when it is installed, otherwise run it as plain Python"""
+    if njit is None:
+        return func
+    return njit(cache=True)(func)
+
+
+@_jit
+def latest_indicators(close: np.ndarray):
+    """Latest SMA(20), SMA(50), RSI(14) and MACD(12, 26) of a close price series in one pass
+    
+    Matches the pandas definitions used before: simple rolling means for the SMAs
+    and RSI gains/losses, adjusted exponential means (ewm(span).mean()) for MACD.
+    Values needing more history than close holds are NaN; RSI needs 15 closes for
+    its 14 price changes.
+    """
+    n = close.shape[0]
+    # Adjusted EWM is a ratio of two decaying sums, updated per sample
+    decay_12 = 1.0 - 2.0 / 13.0
+    decay_26 = 1.0 - 2.0 / 27.0
+    num_12 = den_12 = num_26 = den_26 = 0.0
+    sum_20 = sum_50 = gain_14 = loss_14 = 0.0
+    
+    for i in range(n):
+        x = close[i]
+        num_12 = x + decay_12 * num_12
+        den_12 = 1.0 + decay_12 * den_12
+        num_26 = x + decay_26 * num_26
+        den_26 = 1.0 + decay_26 * den_26
+        
+        # Only the last window of each rolling statistic is ever read
+        if i >= n - 20:
+            sum_20 += x
+        if i >= n - 50:
+            sum_50 += x
+        # RSI(14) needs 14 price changes, i.e. at least 15 closes
+        if n >= 15 and i >= n - 14:
+            delta = x - close[i - 1]
+            if delta > 0.0:
+                gain_14 += delta
+            elif delta < 0.0:
+                loss_14 -= delta
+    
+    sma_20 = sum_20 / 20.0 if n >= 20 else math.nan
+    sma_50 = sum_50 / 50.0 if n >= 50 else math.nan
+    
+    if n < 15:
+        rsi = math.nan
+    elif loss_14 == 0.0:
+        rsi = 100.0 if gain_14 > 0.0 else math.nan
+    else:
+        rsi = 100.0 - 100.0 / (1.0 + gain_14 / loss_14)
+    
+    macd = num_12 / den_12 - num_26 / den_26
+    return sma_20, sma_50, rsi, macd
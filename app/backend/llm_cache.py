@@ -0,0 +1,135 @@
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Optional
+from config import Config
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import threading
+import time
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+
+class LLMCache:
+    """Hash-keyed cache for LLM responses, in memory with an optional Redis backend"""
+    
+    def __init__(self, max_entries: int = Config.LLM_CACHE_MAX_ENTRIES, redis_url: Optional[str] = Config.REDIS_URL):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = None
+        
+        if redis_url:
+            if redis is None:
+                logger.warning("REDIS_URL is set but the redis package is not installed; using in-memory LLM cache")
+            else:
+                self._redis = redis.Redis.from_url(redis_url)
+    
+    @property
+    def shared(self) -> bool:
+        """Whether entries are stored in Redis and so visible to every worker process"""
+        return self._redis is not None
+    
+    @staticmethod
+    def make_key(agent_name: str, method: str, args: tuple, kwargs: dict, prompt_digest: str = "") -> str:
+        """Build a deterministic cache key for an agent call"""
+        payload = {
+            "model": Config.GEMINI_MODEL,
+            "prompts": prompt_digest,
+            "agent": agent_name,
+            "method": method,
+            "args": args,
+            "kwargs": kwargs,
+            # Tools fetch live market data, so results never outlive the day
+            "date_bucket": date.today().isoformat()
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    return value
+                del self._entries[key]
+        
+        if self._redis is not None:
+            try:
+                raw = self._redis.get(f"llm:{key}")
+            except Exception as e:
+                logger.warning("LLM cache Redis lookup failed: %s", e)
+                return None
+            if raw is not None:
+                return json.loads(raw)
+        
+        return None
+    
+    def set(self, key: str, value: Any, ttl: int):
+        """Store value under key for ttl seconds"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        
+        if self._redis is not None:
+            try:
+                self._redis.setex(f"llm:{key}", ttl, json.dumps(value))
+            except Exception as e:
+                logger.warning("LLM cache Redis store failed: %s", e)
+    
+    def clear(self):
+        """Drop every in-memory entry"""
+        with self._lock:
+            self._entries.clear()
+
+
+llm_cache = LLMCache()
+
+
+def cached(ttl: int = Config.LLM_CACHE_TTL):
+    """Cache an agent method's result keyed on the agent, method and arguments"""
+    def decorator(method):
+        def lookup(self, args, kwargs):
+            key = llm_cache.make_key(
+                self.agent.name, method.__name__, args, kwargs, getattr(self, "prompt_digest", "")
+            )
+            result = llm_cache.get(key)
+            if result is not None:
+                logger.info("LLM cache hit for %s.%s", self.agent.name, method.__name__)
+            return key, result
+        
+        if asyncio.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def async_wrapper(self, *args, **kwargs):
+                key, result = lookup(self, args, kwargs)
+                if result is not None:
+                    return result
+                
+                result = await method(self, *args, **kwargs)
+                llm_cache.set(key, result, ttl)
+                return result
+            return async_wrapper
+        
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key, result = lookup(self, args, kwargs)
+            if result is not None:
+                return result
+            
+            result = method(self, *args, **kwargs)
+            llm_cache.set(key, result, ttl)
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,68 @@
+from typing import Any, Dict, Optional
+from cachetools import TTLCache
+from config import Config
+import json
+import logging
+import threading
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+
+class TaskStore:
+    """Background task status records, in Redis when configured so every worker sees them"""
+    
+    def __init__(self, ttl: int = Config.TASK_STATUS_TTL, max_entries: int = Config.TASK_STORE_MAX_ENTRIES, redis_url: Optional[str] = Config.REDIS_URL):
+        self.ttl = ttl
+        # Bounded by size as well as age so a burst of unpolled tasks cannot grow memory without limit
+        self._tasks = TTLCache(maxsize=max_entries, ttl=ttl)
+        self._lock = threading.Lock()
+        self._redis = None
+        
+        if redis_url:
+            if redis is None:
+                logger.warning("REDIS_URL is set but the redis package is not installed; using in-memory task store")
+            else:
+                pool = redis.ConnectionPool.from_url(redis_url, max_connections=Config.REDIS_MAX_CONNECTIONS)
+                self._redis = redis.Redis(connection_pool=pool)
+    
+    @staticmethod
+    def _key(task_id: str) -> str:
+        return f"task:{task_id}"
+    
+    def set(self, task_id: str, fields: Dict[str, Any]):
+        """Create or update a task's fields and restart its expiry"""
+        if self._redis is not None:
+            key = self._key(task_id)
+            # Hash values are strings, so each field is stored JSON-encoded; the update
+            # and its expiry go out together in one round trip
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.hset(key, mapping={name: json.dumps(value) for name, value in fields.items()})
+            pipe.expire(key, self.ttl)
+            pipe.execute()
+            return
+        
+        # TTLCache is not thread-safe; reassigning the entry also restarts its expiry
+        with self._lock:
+            task = self._tasks.get(task_id, {})
+            task.update(fields)
+            self._tasks[task_id] = task
+    
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the task's fields, or None if it is unknown or expired"""
+        if self._redis is not None:
+            raw = self._redis.hgetall(self._key(task_id))
+            if not raw:
+                return None
+            return {name.decode(): json.loads(value) for name, value in raw.items()}
+        
+        with self._lock:
+            task = self._tasks.get(task_id)
+            return None if task is None else dict(task)
+
+
+task_store = TaskStore()
@@ -0,0 +1,73 @@
+from typing import Any, Dict, Optional
+from config import Config
+from workflows import WorkflowFactory
+import logging
+
+try:
+    from celery import Celery
+    from celery.result import AsyncResult
+except ImportError:
+    Celery = None
+
+logger = logging.getLogger(__name__)
+
+# Celery takes background analyses out of the web process when a broker is configured;
+# without one the API falls back to its in-process thread pool
+celery_app = None
+if Config.CELERY_BROKER_URL:
+    if Celery is None:
+        logger.warning("CELERY_BROKER_URL is set but celery is not installed; running analyses in-process")
+    else:
+        celery_app = Celery(
+            "intellimarket",
+            broker=Config.CELERY_BROKER_URL,
+            backend=Config.CELERY_RESULT_BACKEND or Config.CELERY_BROKER_URL
+        )
+        celery_app.conf.update(
+            task_serializer="json",
+            result_serializer="json",
+            accept_content=["json"],
+            task_track_started=True,
+            # Results are dropped by the backend instead of by a cleanup pass in the API
+            result_expires=Config.TASK_STATUS_TTL
+        )
+
+
+def run_analysis(symbol: str, analysis_type: str) -> Any:
+    """Run a quick or comprehensive analysis for symbol"""
+    workflow = WorkflowFactory.create_investment_workflow()
+    if analysis_type == 'quick':
+        return workflow.quick_analysis(symbol)
+    return workflow.analyze_stock(symbol)
+
+
+if celery_app is not None:
+    @celery_app.task(bind=True, name="intellimarket.run_stock_analysis")
+    def run_stock_analysis(self, symbol: str, analysis_type: str) -> Any:
+        logger.info(f"Starting queued {analysis_type} analysis for {symbol}")
+        self.update_state(state="PROGRESS", meta={"progress": 25})
+        return run_analysis(symbol, analysis_type)
+
+
+def celery_status(task_id: str) -> Optional[Dict[str, Any]]:
+    """Status fields for a Celery task in the API's task status format, or None without Celery"""
+    if celery_app is None:
+        return None
+    
+    result = AsyncResult(task_id, app=celery_app)
+    state = result.state
+    if state == "SUCCESS":
+        status = {"status": "completed", "progress": 100, "result": result.result}
+        if result.date_done:
+            status["completed_at"] = result.date_done.isoformat()
+        return status
+    if state == "FAILURE":
+        status = {"status": "failed", "error": str(result.result)}
+        if result.date_done:
+            status["failed_at"] = result.date_done.isoformat()
+        return status
+    if state == "PROGRESS":
+        return {"status": "processing", "progress": (result.info or {}).get("progress", 25)}
+    if state == "STARTED":
+        return {"status": "processing"}
+    return {}
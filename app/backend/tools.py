@@ -1,30 +1,134 @@
 import yfinance as yf
-import requests
 from duckduckgo_search import DDGS
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import json
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from agno.tools import Toolkit
-from pydantic import BaseModel, Field
-import markdown
-from io import BytesIO
-import tempfile
-import os
+from cachetools import TTLCache, cached
+from config import Config
+from indicators import latest_indicators
+from io import BytesIO, StringIO
+from types import MappingProxyType
 import re
-from reportlab.lib.pagesizes import letter, A4
+import string
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib.colors import HexColor, black, white
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT, TA_JUSTIFY
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
 
 logger = logging.getLogger(__name__)
 
+# Quotes and company info change slowly relative to request rates, so repeat
+# lookups within MARKET_DATA_CACHE_TTL seconds are served from memory
+_ticker_info_cache = TTLCache(maxsize=Config.MARKET_DATA_CACHE_SIZE, ttl=Config.MARKET_DATA_CACHE_TTL)
+_ticker_info_lock = threading.Lock()
+_stock_data_cache = TTLCache(maxsize=Config.MARKET_DATA_CACHE_SIZE, ttl=Config.MARKET_DATA_CACHE_TTL)
+_stock_data_lock = threading.Lock()
+_history_cache = TTLCache(maxsize=Config.MARKET_DATA_CACHE_SIZE, ttl=Config.MARKET_DATA_CACHE_TTL)
+_history_lock = threading.Lock()
+
+# Runs the info request alongside the history request of a single-symbol lookup;
+# threads start on first use, so nothing is running when the app is preloaded
+_info_prefetch_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="info-prefetch")
+
+
+@cached(cache=_ticker_info_cache, key=lambda symbol: symbol.upper(), lock=_ticker_info_lock)
+def get_ticker_info(symbol: str) -> Dict[str, Any]:
+    """yfinance info for a symbol, memoized for MARKET_DATA_CACHE_TTL seconds"""
+    return yf.Ticker(symbol).info
+
+
+@cached(cache=_history_cache, key=lambda symbol, period: (symbol.upper(), period), lock=_history_lock)
+def get_price_history(symbol: str, period: str) -> pd.DataFrame:
+    """yfinance price history for a symbol, memoized for MARKET_DATA_CACHE_TTL seconds
+    
+    The frame is shared between callers, so it must not be modified in place.
+    """
+    return yf.Ticker(symbol).history(period=period)
+
+
+# Thresholds and suffixes for formatted dollar amounts, largest first
+_NUMBER_SCALES = ((1e12, "T"), (1e9, "B"), (1e6, "M"), (1e3, "K"))
+
+
+@lru_cache(maxsize=4096)
+def _format_scaled(number: float) -> str:
+    """Dollar amount with a T/B/M/K suffix; market caps and revenues repeat across tools"""
+    for threshold, suffix in _NUMBER_SCALES:
+        if number >= threshold:
+            return f"${number/threshold:.1f}{suffix}"
+    return f"${number:.2f}"
+
+
+# (result field, info keys in order of preference, scale) for get_stock_data's rounded metrics
+_ROUNDED_INFO_FIELDS = (
+    ("pe_ratio", ("trailingPE", "forwardPE"), 1),
+    ("eps", ("trailingEps", "forwardEps"), 1),
+    ("dividend_yield", ("dividendYield",), 100),
+    ("52_week_high", ("fiftyTwoWeekHigh",), 1),
+    ("52_week_low", ("fiftyTwoWeekLow",), 1),
+    ("gross_margin", ("grossMargins",), 100),
+    ("operating_margin", ("operatingMargins",), 100),
+    ("profit_margin", ("profitMargins",), 100),
+    ("roe", ("returnOnEquity",), 100),
+    ("debt_to_equity", ("debtToEquity",), 1),
+    ("current_ratio", ("currentRatio",), 1),
+    ("book_value", ("bookValue",), 1)
+)
+
+
+# Yahoo serves at most about 20 symbols per download request
+_DOWNLOAD_BATCH_SIZE = 20
+
+
+def get_price_histories(symbols: List[str], period: str) -> Dict[str, pd.DataFrame]:
+    """Price histories for several symbols, downloading the uncached ones together
+    
+    Symbols whose download failed or came back empty are left out, for callers to fetch one by one.
+    """
+    histories = {}
+    with _history_lock:
+        for symbol in symbols:
+            hist = _history_cache.get((symbol.upper(), period))
+            if hist is not None:
+                histories[symbol] = hist
+    missing = [symbol for symbol in symbols if symbol not in histories]
+    
+    for start in range(0, len(missing), _DOWNLOAD_BATCH_SIZE):
+        batch = missing[start:start + _DOWNLOAD_BATCH_SIZE]
+        try:
+            logger.info(f"Batch downloading price history for {batch}")
+            frame = yf.download(batch, period=period, group_by='ticker', threads=True, progress=False)
+        except Exception as e:
+            logger.warning(f"Batch download failed for {batch}: {e}")
+            continue
+        
+        grouped = isinstance(frame.columns, pd.MultiIndex)
+        downloaded = set(frame.columns.get_level_values(0)) if grouped else set(batch)
+        for symbol in batch:
+            if symbol in downloaded:
+                hist = (frame[symbol] if grouped else frame).dropna(how='all')
+                # yfinance returns an all-NaN column for a failed ticker; leave it for the fallback
+                if not hist.empty:
+                    histories[symbol] = hist
+        
+        # Later single-symbol lookups reuse the downloaded histories
+        with _history_lock:
+            for symbol in batch:
+                if symbol in histories:
+                    _history_cache[(symbol.upper(), period)] = histories[symbol]
+    
+    return histories
+
 
 class FinancialDataTool(Toolkit):
     """Tool for fetching financial data using YFinance"""
@@ -35,50 +139,112 @@ class FinancialDataTool(Toolkit):
             return "N/A"
         
         try:
-            number = float(number)
-            
-            if number >= 1e12:
-                return f"${number/1e12:.1f}T"
-            elif number >= 1e9:
-                return f"${number/1e9:.1f}B"
-            elif number >= 1e6:
-                return f"${number/1e6:.1f}M"
-            elif number >= 1e3:
-                return f"${number/1e3:.1f}K"
-            else:
-                return f"${number:.2f}"
+            return _format_scaled(float(number))
         except (ValueError, TypeError):
             return "N/A"
     
     def get_stock_data(self, symbol: str, period: str = "1y") -> Dict[str, Any]:
         """Get stock price data and basic info"""
+        key = (symbol.upper(), period)
+        with _stock_data_lock:
+            data = _stock_data_cache.get(key)
+        if data is not None:
+            return data
+        
+        data = self._fetch_stock_data(symbol, period)
+        # Failed lookups are retried on the next call rather than cached
+        if "error" not in data:
+            with _stock_data_lock:
+                _stock_data_cache[key] = data
+        return data
+    
+    def get_price_summary(self, symbol: str) -> Dict[str, Any]:
+        """Current price and market cap only, without the full info request when possible"""
+        with _stock_data_lock:
+            data = _stock_data_cache.get((symbol.upper(), "1y"))
+        if data is not None:
+            return data
+        
         try:
-            logger.info(f"Fetching stock data for {symbol}")
-            ticker = yf.Ticker(symbol)
-            
-            # Get historical data
-            hist = ticker.history(period=period)
-            
-            # Get stock info
-            info = ticker.info
+            # fast_info reads the quote endpoint instead of scraping the full quote summary
+            fast_info = yf.Ticker(symbol).fast_info
+            current_price = fast_info.last_price
+            market_cap = fast_info.market_cap
+            return {
+                "symbol": symbol,
+                "current_price": round(current_price, 2) if current_price else None,
+                "market_cap": market_cap,
+                "market_cap_formatted": self._format_large_number(market_cap)
+            }
+        except Exception as e:
+            logger.warning(f"Quick quote failed for {symbol}, falling back to full data: {e}")
+            return self.get_stock_data(symbol)
+    
+    def get_stock_data_batch(self, symbols: List[str], period: str = "1y") -> Dict[str, Dict[str, Any]]:
+        """Get stock data for several symbols, downloading all price histories in one request"""
+        results = {}
+        with _stock_data_lock:
+            for symbol in symbols:
+                data = _stock_data_cache.get((symbol.upper(), period))
+                if data is not None:
+                    results[symbol] = data
+        missing = [symbol for symbol in symbols if symbol not in results]
+        if not missing:
+            return results
+        
+        logger.info(f"Batch fetching stock data for {missing}")
+        histories = get_price_histories(missing, period)
+        
+        def fetch(symbol):
+            # One bad ticker must not fail the whole batch; any history the batch
+            # download missed is fetched on its own
+            try:
+                return self._fetch_stock_data(symbol, period, histories.get(symbol))
+            except Exception as e:
+                logger.error(f"Error fetching stock data for {symbol}: {e}")
+                return {"error": str(e)}
+        
+        # Company info is still per symbol, so look it up concurrently
+        with ThreadPoolExecutor(max_workers=min(len(missing), 10)) as executor:
+            fetched = dict(zip(missing, executor.map(fetch, missing)))
+        
+        with _stock_data_lock:
+            for symbol, data in fetched.items():
+                if "error" not in data:
+                    _stock_data_cache[(symbol.upper(), period)] = data
+        results.update(fetched)
+        return {symbol: results[symbol] for symbol in symbols}
+    
+    def _fetch_stock_data(self, symbol: str, period: str, hist: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+        """Fetch stock price data and basic info from yfinance, reusing hist when already downloaded"""
+        try:
+            info_future = None
+            if hist is None:
+                logger.info(f"Fetching stock data for {symbol}")
+                # The info and history requests are independent, so they overlap
+                info_future = _info_prefetch_pool.submit(get_ticker_info, symbol)
+                # Get historical data
+                hist = get_price_history(symbol, period)
             
+            # Bail out before waiting on info when there is nothing to report
             if hist.empty:
                 logger.warning(f"No historical data available for {symbol}")
                 return {"error": f"No historical data available for {symbol}"}
             
-            # Calculate basic metrics
-            current_price = hist['Close'].iloc[-1] if len(hist) > 0 else None
-            price_change = hist['Close'].iloc[-1] - hist['Close'].iloc[-2] if len(hist) > 1 else 0
-            price_change_pct = (price_change / hist['Close'].iloc[-2]) * 100 if len(hist) > 1 else 0
+            # Get stock info, shared with symbol validation through the info cache
+            info = info_future.result() if info_future is not None else get_ticker_info(symbol)
+            
+            # Calculate basic metrics on the raw arrays rather than through pandas indexing
+            close = hist['Close'].to_numpy()
+            volume = hist['Volume'].to_numpy()
+            current_price = close[-1] if len(close) > 0 else None
+            price_change = close[-1] - close[-2] if len(close) > 1 else 0
+            price_change_pct = (price_change / close[-2]) * 100 if len(close) > 1 else 0
             
             # Format market cap properly
             market_cap = info.get("marketCap") or info.get("marketCapitalization")
             market_cap_formatted = self._format_large_number(market_cap) if market_cap else "N/A"
             
-            # Format other financial metrics
-            pe_ratio = info.get("trailingPE") or info.get("forwardPE")
-            eps = info.get("trailingEps") or info.get("forwardEps")
-            
             # Format revenue
             revenue = info.get("totalRevenue") or info.get("revenue")
             revenue_formatted = self._format_large_number(revenue) if revenue else "N/A"
@@ -94,12 +260,7 @@ class FinancialDataTool(Toolkit):
                 "price_change_pct": round(price_change_pct, 2),
                 "market_cap": market_cap,
                 "market_cap_formatted": market_cap_formatted,
-                "pe_ratio": round(pe_ratio, 2) if pe_ratio else None,
-                "eps": round(eps, 2) if eps else None,
-                "dividend_yield": round(info.get("dividendYield") * 100, 2) if info.get("dividendYield") else None,
-                "52_week_high": round(info.get("fiftyTwoWeekHigh"), 2) if info.get("fiftyTwoWeekHigh") else None,
-                "52_week_low": round(info.get("fiftyTwoWeekLow"), 2) if info.get("fiftyTwoWeekLow") else None,
-                "volume": int(hist['Volume'].iloc[-1]) if len(hist) > 0 else None,
+                "volume": int(volume[-1]) if len(volume) > 0 else None,
                 "avg_volume": int(info.get("averageVolume")) if info.get("averageVolume") else None,
                 "sector": info.get("sector") or "N/A",
                 "industry": info.get("industry") or "N/A",
@@ -107,76 +268,72 @@ class FinancialDataTool(Toolkit):
                 # Additional financial metrics with proper formatting
                 "revenue": revenue,
                 "revenue_formatted": revenue_formatted,
-                "gross_margin": round(info.get("grossMargins") * 100, 2) if info.get("grossMargins") else None,
-                "operating_margin": round(info.get("operatingMargins") * 100, 2) if info.get("operatingMargins") else None,
-                "profit_margin": round(info.get("profitMargins") * 100, 2) if info.get("profitMargins") else None,
-                "roe": round(info.get("returnOnEquity") * 100, 2) if info.get("returnOnEquity") else None,
-                "debt_to_equity": round(info.get("debtToEquity"), 2) if info.get("debtToEquity") else None,
-                "current_ratio": round(info.get("currentRatio"), 2) if info.get("currentRatio") else None,
-                "book_value": round(info.get("bookValue"), 2) if info.get("bookValue") else None,
                 "enterprise_value": enterprise_value,
                 "enterprise_value_formatted": enterprise_value_formatted
             }
             
+            # Ratios and prices: first non-empty info key, scaled and rounded to 2 places
+            get = info.get
+            for field, keys, scale in _ROUNDED_INFO_FIELDS:
+                value = next((v for v in map(get, keys) if v), None)
+                result[field] = round(value * scale, 2) if value else None
+            
             return result
             
         except Exception as e:
             logger.error(f"Failed to fetch data for {symbol}: {e}")
             return {"error": f"Failed to fetch data for {symbol}: {str(e)}"}
     
+    async def aget_stock_data(self, symbol: str, period: str = "1y") -> Dict[str, Any]:
+        """Async variant of get_stock_data that keeps the event loop free during the fetch"""
+        return await asyncio.to_thread(self.get_stock_data, symbol, period)
+    
     def get_financial_statements(self, symbol: str) -> Dict[str, Any]:
         """Get financial statements"""
         try:
             logger.info(f"Fetching financial statements for {symbol}")
+            # One Ticker serves all three statements
             ticker = yf.Ticker(symbol)
             
-            # Get financial statements
-            income_stmt = ticker.financials
-            balance_sheet = ticker.balance_sheet
-            cash_flow = ticker.cashflow
-            
             return {
                 "symbol": symbol,
-                "income_statement": income_stmt.to_dict() if not income_stmt.empty else {},
-                "balance_sheet": balance_sheet.to_dict() if not balance_sheet.empty else {},
-                "cash_flow": cash_flow.to_dict() if not cash_flow.empty else {}
+                "income_statement": self._statement_table(ticker.financials),
+                "balance_sheet": self._statement_table(ticker.balance_sheet),
+                "cash_flow": self._statement_table(ticker.cashflow)
             }
         except Exception as e:
             logger.error(f"Failed to fetch financial statements for {symbol}: {e}")
             return {"error": f"Failed to fetch financial statements for {symbol}: {str(e)}"}
     
+    def _statement_table(self, frame: pd.DataFrame) -> Dict[str, Any]:
+        """A statement as split-oriented lists, converted in bulk instead of cell by cell via to_dict"""
+        if frame.empty:
+            return {}
+        
+        columns = frame.columns
+        # Statement columns are period end dates; plain strings keep the result JSON-ready
+        if isinstance(columns, pd.DatetimeIndex):
+            columns = columns.strftime('%Y-%m-%d')
+        return {
+            "columns": columns.astype(str).tolist(),
+            "index": frame.index.astype(str).tolist(),
+            "data": frame.to_numpy().tolist()
+        }
+    
     def calculate_technical_indicators(self, symbol: str, period: str = "6mo") -> Dict[str, Any]:
         """Calculate basic technical indicators"""
         try:
             logger.info(f"Calculating technical indicators for {symbol}")
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period=period)
+            hist = get_price_history(symbol, period)
             
             if hist.empty:
                 return {"error": "No data available"}
             
-            # Simple Moving Averages
-            sma_20 = hist['Close'].rolling(window=20).mean()
-            sma_50 = hist['Close'].rolling(window=50).mean()
-            
-            # RSI
-            delta = hist['Close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            
-            # MACD
-            exp1 = hist['Close'].ewm(span=12).mean()
-            exp2 = hist['Close'].ewm(span=26).mean()
-            macd = exp1 - exp2
-            signal = macd.ewm(span=9).mean()
-            
-            current_price = hist['Close'][-1]
-            current_sma_20 = sma_20[-1] if not sma_20.empty else None
-            current_sma_50 = sma_50[-1] if not sma_50.empty else None
-            current_rsi = rsi[-1] if not rsi.empty else None
-            current_macd = macd[-1] if not macd.empty else None
+            # SMA 20/50, RSI and MACD only need their latest values, so one compiled
+            # pass over the closes replaces the chain of full-length pandas series
+            close = hist['Close'].to_numpy(dtype=np.float64)
+            current_price = close[-1]
+            current_sma_20, current_sma_50, current_rsi, current_macd = latest_indicators(close)
             
             return {
                 "symbol": symbol,
@@ -196,6 +353,57 @@ class FinancialDataTool(Toolkit):
             return {"error": f"Failed to calculate technical indicators for {symbol}: {str(e)}"}
 
 
+# Shared by the tools that need stock data so none of them builds its own per call
+_FINANCIAL_DATA_TOOL = FinancialDataTool()
+
+
+# Searches run concurrently from several agents, so each thread keeps its own client
+# (and HTTP session) rather than sharing one behind a lock or opening one per search
+_ddgs_local = threading.local()
+
+
+def _ddgs() -> DDGS:
+    """This thread's DuckDuckGo search client"""
+    client = getattr(_ddgs_local, "client", None)
+    if client is None:
+        client = _ddgs_local.client = DDGS()
+    return client
+
+
+# The same company and topic queries repeat within one analysis, so results are kept briefly;
+# failed searches raise out of these helpers and are not cached
+_search_cache = TTLCache(maxsize=1024, ttl=Config.SEARCH_CACHE_TTL)
+_search_lock = threading.Lock()
+
+
+@cached(cache=_search_cache, key=lambda query, max_results: ("news", query, max_results), lock=_search_lock)
+def _news_results(query: str, max_results: int) -> List[Dict[str, Any]]:
+    """DuckDuckGo news results for query, memoized for SEARCH_CACHE_TTL seconds"""
+    return [
+        {
+            "title": result.get("title", ""),
+            "url": result.get("url", ""),
+            "source": result.get("source", ""),
+            "date": result.get("date", ""),
+            "body": result.get("body", "")[:300]
+        }
+        for result in _ddgs().news(query, max_results=max_results)
+    ]
+
+
+@cached(cache=_search_cache, key=lambda query, max_results: ("text", query, max_results), lock=_search_lock)
+def _text_results(query: str, max_results: int) -> List[Dict[str, Any]]:
+    """DuckDuckGo web results for query, memoized for SEARCH_CACHE_TTL seconds"""
+    return [
+        {
+            "title": result.get("title", ""),
+            "url": result.get("href", ""),
+            "snippet": result.get("body", "")[:300]
+        }
+        for result in _ddgs().text(query, max_results=max_results)
+    ]
+
+
 class WebResearchTool(Toolkit):
     """Tool for web research using DuckDuckGo"""
     
@@ -203,39 +411,72 @@ class WebResearchTool(Toolkit):
         """Search for news articles"""
         try:
             logger.info(f"Searching news for: {query}")
-            with DDGS() as ddgs:
-                results = []
-                for result in ddgs.news(query, max_results=max_results):
-                    results.append({
-                        "title": result.get("title", ""),
-                        "url": result.get("url", ""),
-                        "source": result.get("source", ""),
-                        "date": result.get("date", ""),
-                        "body": result.get("body", "")[:300]
-                    })
-                logger.info(f"Found {len(results)} news articles")
-                return results
+            results = _news_results(query, max_results)
+            logger.info(f"Found {len(results)} news articles")
+            return results
         except Exception as e:
             logger.error(f"News search failed for {query}: {e}")
             return [{"error": f"Search failed: {str(e)}"}]
     
+    async def asearch_news(self, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
+        """Async variant of search_news"""
+        return await asyncio.to_thread(self.search_news, query, max_results)
+    
     def search_general(self, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
         """General web search"""
         try:
             logger.info(f"Performing general search for: {query}")
-            with DDGS() as ddgs:
-                results = []
-                for result in ddgs.text(query, max_results=max_results):
-                    results.append({
-                        "title": result.get("title", ""),
-                        "url": result.get("href", ""),
-                        "snippet": result.get("body", "")[:300]
-                    })
-                logger.info(f"Found {len(results)} search results")
-                return results
+            results = _text_results(query, max_results)
+            logger.info(f"Found {len(results)} search results")
+            return results
         except Exception as e:
             logger.error(f"General search failed for {query}: {e}")
             return [{"error": f"Search failed: {str(e)}"}]
+    
+    async def asearch_general(self, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
+        """Async variant of search_general"""
+        return await asyncio.to_thread(self.search_general, query, max_results)
+    
+    async def asearch_many(self, queries: List[str], kind: str = "news", max_results: int = 10) -> List[List[Dict[str, Any]]]:
+        """Run several news or general searches concurrently, returning results in query order"""
+        search = self.asearch_news if kind == "news" else self.asearch_general
+        return await asyncio.gather(*(search(query, max_results) for query in queries))
+
+
+# (comparison field, stock data key) pairs picked for each compared company
+_COMPARISON_FIELDS = (
+    ("current_price", "current_price"),
+    ("market_cap", "market_cap_formatted"),
+    ("pe_ratio", "pe_ratio"),
+    ("price_change_pct", "price_change_pct"),
+    ("sector", "sector"),
+    ("industry", "industry"),
+    ("revenue", "revenue_formatted"),
+    ("gross_margin", "gross_margin"),
+    ("operating_margin", "operating_margin"),
+    ("roe", "roe")
+)
+
+# Peer groups; every member of a group lists the others as its peers
+_SECTOR_GROUPS = {
+    "tech_mega": ("AAPL", "MSFT", "GOOGL", "META", "AMZN"),
+    "auto_ev": ("TSLA", "GM", "F", "RIVN", "LCID"),
+    "semis": ("NVDA", "AMD", "INTC", "QCOM", "AVGO")
+}
+
+# Expanded to symbol -> peers once at import; tuples keep callers from mutating the shared table
+_SECTOR_PEERS = MappingProxyType({
+    symbol: tuple(peer for peer in members if peer != symbol)
+    for members in _SECTOR_GROUPS.values()
+    for symbol in members
+})
+
+
+def prewarm_market_data():
+    """Load stock data for every symbol in the sector peer table into the market data caches"""
+    symbols = sorted(_SECTOR_PEERS)
+    logger.info(f"Prewarming market data for {len(symbols)} symbols")
+    _FINANCIAL_DATA_TOOL.get_stock_data_batch(symbols)
 
 
 class CompetitiveAnalysisTool(Toolkit):
@@ -245,119 +486,201 @@ class CompetitiveAnalysisTool(Toolkit):
         """Compare multiple companies"""
         logger.info(f"Comparing companies: {symbols}")
         comparison_data = {}
-        financial_tool = FinancialDataTool()
         
-        for symbol in symbols:
-            data = financial_tool.get_stock_data(symbol)
+        for symbol, data in _FINANCIAL_DATA_TOOL.get_stock_data_batch(symbols).items():
             if "error" not in data:
-                comparison_data[symbol] = {
-                    "current_price": data.get("current_price"),
-                    "market_cap": data.get("market_cap_formatted"),
-                    "pe_ratio": data.get("pe_ratio"),
-                    "price_change_pct": data.get("price_change_pct"),
-                    "sector": data.get("sector"),
-                    "industry": data.get("industry"),
-                    "revenue": data.get("revenue_formatted"),
-                    "gross_margin": data.get("gross_margin"),
-                    "operating_margin": data.get("operating_margin"),
-                    "roe": data.get("roe")
-                }
+                comparison_data[symbol] = self._comparison_entry(data)
         
         return {
             "comparison_data": comparison_data,
             "analysis_timestamp": datetime.now().isoformat()
         }
     
-    def get_sector_peers(self, symbol: str) -> List[str]:
-        """Get sector peers for a given stock"""
-        sector_peers = {
-            "AAPL": ["MSFT", "GOOGL", "META", "AMZN"],
-            "TSLA": ["GM", "F", "RIVN", "LCID"],
-            "NVDA": ["AMD", "INTC", "QCOM", "AVGO"],
-            "MSFT": ["AAPL", "GOOGL", "META", "AMZN"],
-            "GOOGL": ["AAPL", "MSFT", "META", "AMZN"]
+    async def acompare_companies(self, symbols: List[str]) -> Dict[str, Any]:
+        """Compare multiple companies, fetching every symbol's data concurrently"""
+        logger.info(f"Comparing companies concurrently: {symbols}")
+        financial_tool = _FINANCIAL_DATA_TOOL
+        results = await asyncio.gather(*(financial_tool.aget_stock_data(symbol) for symbol in symbols))
+        
+        return {
+            "comparison_data": {
+                symbol: self._comparison_entry(data)
+                for symbol, data in zip(symbols, results)
+                if "error" not in data
+            },
+            "analysis_timestamp": datetime.now().isoformat()
         }
-        return sector_peers.get(symbol.upper(), [])
+    
+    def _comparison_entry(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Pick the fields used when comparing companies"""
+        get = data.get
+        return {field: get(key) for field, key in _COMPARISON_FIELDS}
+    
+    def get_sector_peers(self, symbol: str) -> Tuple[str, ...]:
+        """Get sector peers for a given stock"""
+        return _SECTOR_PEERS.get(symbol.upper(), ())
+
+
+# Shared chart layouts, validated and given their template once; go.Figure copies the
+# layout it is passed, so each chart only sets its own title on top
+_PRICE_CHART_LAYOUT = go.Layout(
+    yaxis_title="Price ($)",
+    xaxis_title="Date",
+    template="plotly_white"
+)
+_COMPARISON_CHART_LAYOUT = go.Layout(
+    yaxis_title="Percentage Change (%)",
+    xaxis_title="Date",
+    template="plotly_white",
+    legend=dict(x=0, y=1)
+)
 
 
 class ChartGenerationTool(Toolkit):
     """Tool for generating charts and visualizations"""
     
-    def create_price_chart(self, symbol: str, period: str = "6mo") -> str:
-        """Create a price chart for a stock"""
+    def _render(self, fig: go.Figure, output_format: str) -> str:
+        """Serialize a figure for a page that already loads Plotly.js"""
+        if output_format == "html":
+            # A bare <div> and <script> fragment instead of a full document per chart
+            return fig.to_html(include_plotlyjs=False, full_html=False)
+        return fig.to_json(pretty=False)
+    
+    def _price_figure(self, symbol: str, period: str) -> Optional[go.Figure]:
+        """Candlestick figure of a stock's price history, or None when there is no data"""
+        hist = get_price_history(symbol, period)
+        if hist.empty:
+            return None
+        
+        fig = go.Figure(layout=_PRICE_CHART_LAYOUT)
+        
+        # Plain float32 arrays skip Plotly's per-Series handling and halve the
+        # encoded trace data; chart precision does not need float64
+        ohlc = hist[['Open', 'High', 'Low', 'Close']].to_numpy(dtype=np.float32).T
+        
+        # Add candlestick chart
+        fig.add_trace(go.Candlestick(
+            x=hist.index.to_numpy(),
+            open=ohlc[0],
+            high=ohlc[1],
+            low=ohlc[2],
+            close=ohlc[3],
+            name=symbol
+        ))
+        
+        fig.update_layout(title=f"{symbol} Stock Price ({period})")
+        
+        return fig
+    
+    def create_price_chart(self, symbol: str, period: str = "6mo", output_format: str = "json") -> str:
+        """Create a price chart for a stock as Plotly JSON, or an embeddable HTML fragment"""
         try:
             logger.info(f"Creating price chart for {symbol}")
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period=period)
+            fig = self._price_figure(symbol, period)
             
-            if hist.empty:
+            if fig is None:
                 return "No data available for chart generation"
             
-            fig = go.Figure()
-            
-            # Add candlestick chart
-            fig.add_trace(go.Candlestick(
-                x=hist.index,
-                open=hist['Open'],
-                high=hist['High'],
-                low=hist['Low'],
-                close=hist['Close'],
-                name=symbol
-            ))
-            
-            fig.update_layout(
-                title=f"{symbol} Stock Price ({period})",
-                yaxis_title="Price ($)",
-                xaxis_title="Date",
-                template="plotly_white"
-            )
-            
-            return fig.to_html(include_plotlyjs='cdn')
+            return self._render(fig, output_format)
         except Exception as e:
             logger.error(f"Chart generation failed for {symbol}: {e}")
             return f"Chart generation failed: {str(e)}"
     
-    def create_comparison_chart(self, symbols: List[str], period: str = "6mo") -> str:
-        """Create a comparison chart for multiple stocks"""
+    def create_price_chart_png(self, symbol: str, period: str = "6mo") -> Optional[bytes]:
+        """Render a price chart as PNG bytes for the PDF report, or None if it cannot be drawn"""
+        try:
+            fig = self._price_figure(symbol, period)
+            if fig is None:
+                return None
+            # Static export needs the kaleido package
+            return fig.to_image(format="png", width=900, height=400)
+        except Exception as e:
+            logger.warning(f"PNG chart generation failed for {symbol}: {e}")
+            return None
+    
+    def create_comparison_chart(self, symbols: List[str], period: str = "6mo", output_format: str = "json") -> str:
+        """Create a comparison chart for multiple stocks as Plotly JSON, or an embeddable HTML fragment"""
         try:
             logger.info(f"Creating comparison chart for {symbols}")
-            fig = go.Figure()
+            fig = go.Figure(layout=_COMPARISON_CHART_LAYOUT)
+            histories = get_price_histories(symbols, period)
             
             for symbol in symbols:
-                ticker = yf.Ticker(symbol)
-                hist = ticker.history(period=period)
+                hist = histories.get(symbol)
+                if hist is None:
+                    hist = get_price_history(symbol, period)
                 
                 if not hist.empty:
-                    # Normalize to percentage change
-                    normalized = (hist['Close'] / hist['Close'].iloc[0] - 1) * 100
+                    # Normalize to percentage change on the raw array; the closes share one
+                    # scale factor, so this is a single multiply and an in-place subtract
+                    close = hist['Close'].to_numpy(dtype=np.float64)
+                    normalized = close * (100.0 / close[0])
+                    normalized -= 100.0
                     
                     fig.add_trace(go.Scatter(
-                        x=hist.index,
-                        y=normalized,
+                        x=hist.index.to_numpy(),
+                        y=normalized.astype(np.float32),
                         mode='lines',
                         name=symbol,
                         line=dict(width=2)
                     ))
             
-            fig.update_layout(
-                title=f"Stock Price Comparison ({period})",
-                yaxis_title="Percentage Change (%)",
-                xaxis_title="Date",
-                template="plotly_white",
-                legend=dict(x=0, y=1)
-            )
+            fig.update_layout(title=f"Stock Price Comparison ({period})")
             
-            return fig.to_html(include_plotlyjs='cdn')
+            return self._render(fig, output_format)
         except Exception as e:
             logger.error(f"Comparison chart generation failed: {e}")
             return f"Comparison chart generation failed: {str(e)}"
 
 
+# Inline markdown and financial highlighting patterns for PDF text, compiled once
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_BOLD_RE = re.compile(r'\*\*([^*]+)\*\*')
+_ITALIC_RE = re.compile(r'\*([^*]+)\*')
+# Bold, italic, amount, percentage and symbol in one alternation, so a single left-to-right
+# pass styles each span once and never rescans markup it has already inserted
+_INLINE_RE = re.compile(
+    r'\*\*([^*]+)\*\*'
+    r'|\*([^*]+)\*'
+    r'|\$([0-9]+(?:\.[0-9]+)?[KMB]?)'
+    r'|([0-9]+(?:\.[0-9]+)?%)'
+    r'|\b([A-Z]{2,5})\b(?!\s*[a-z])'
+)
+_AMOUNT_CELL_RE = re.compile(r'^\$[0-9]+(?:\.[0-9]+)?[KMB]?$')
+_PERCENT_CELL_RE = re.compile(r'^[0-9]+(?:\.[0-9]+)?%$')
+_SYMBOL_CELL_RE = re.compile(r'^[A-Z]{2,5}$')
+# A line reading ![chart:SYMBOL] is replaced by that stock's price chart
+_CHART_TOKEN_RE = re.compile(r'^!\[chart:([A-Z][A-Z.\-]{0,4})\]$')
+
+
+def _style_inline(match: re.Match) -> str:
+    """ReportLab markup for one _INLINE_RE match"""
+    bold, italic, amount, percent, symbol = match.groups()
+    if bold is not None:
+        # Amounts and symbols inside emphasis are still highlighted
+        return f'<b>{_INLINE_RE.sub(_style_inline, bold)}</b>'
+    if italic is not None:
+        return f'<i>{_INLINE_RE.sub(_style_inline, italic)}</i>'
+    if amount is not None:
+        return f'<font color="#38a169" face="Courier-Bold">${amount}</font>'
+    if percent is not None:
+        return f'<font color="#3182ce" face="Courier-Bold">{percent}</font>'
+    return f'<font color="#667eea" face="Courier-Bold">{symbol}</font>'
+
+
+@lru_cache(maxsize=4096)
+def _format_pdf_text(text: str) -> str:
+    """ReportLab markup for a line of report text; table labels and headings repeat across reports"""
+    return _INLINE_RE.sub(_style_inline, text)
+
+
 class PDFGenerationTool(Toolkit):
     """Tool for generating PDF reports from markdown content using ReportLab"""
     
     def __init__(self):
         self.styles = self._create_styles()
+        self._charts = ChartGenerationTool()
+        self._heading_styles = tuple(self.styles[name] for name in ('IntelliHeading1', 'IntelliHeading2', 'IntelliHeading3'))
     
     def _create_styles(self):
         """Create custom paragraph styles for the PDF"""
@@ -482,25 +805,45 @@ class PDFGenerationTool(Toolkit):
         story.append(Paragraph(f"Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", self.styles['IntelliReportSubtitle']))
         story.append(Spacer(1, 20))
         
-        # Split content into lines
-        lines = content.split('\n')
+        # Iterate over the lines in place instead of materializing a list of them
         current_list_items = []
+        # Consecutive body lines become one Paragraph, keeping the flowable count down
+        body_lines = []
         in_table = False
         table_data = []
+        heading_styles = self._heading_styles
         
-        for line in lines:
+        for line in StringIO(content):
             line = line.strip()
             
             if not line:
                 # Add spacing for empty lines
+                if body_lines:
+                    self._add_paragraph_to_story(story, body_lines)
+                    body_lines = []
                 if current_list_items:
                     self._add_list_to_story(story, current_list_items)
                     current_list_items = []
                 story.append(Spacer(1, 6))
                 continue
             
+            # Handle chart placeholders
+            chart = _CHART_TOKEN_RE.match(line)
+            if chart:
+                if body_lines:
+                    self._add_paragraph_to_story(story, body_lines)
+                    body_lines = []
+                if current_list_items:
+                    self._add_list_to_story(story, current_list_items)
+                    current_list_items = []
+                self._add_chart_to_story(story, chart.group(1))
+                continue
+            
             # Handle headers
             if line.startswith('#'):
+                if body_lines:
+                    self._add_paragraph_to_story(story, body_lines)
+                    body_lines = []
                 if current_list_items:
                     self._add_list_to_story(story, current_list_items)
                     current_list_items = []
@@ -508,16 +851,16 @@ class PDFGenerationTool(Toolkit):
                 level = len(line) - len(line.lstrip('#'))
                 header_text = line.lstrip('#').strip()
                 
-                if level == 1:
-                    story.append(Paragraph(self._format_text(header_text), self.styles['IntelliHeading1']))
-                elif level == 2:
-                    story.append(Paragraph(self._format_text(header_text), self.styles['IntelliHeading2']))
-                else:
-                    story.append(Paragraph(self._format_text(header_text), self.styles['IntelliHeading3']))
+                # Levels 3 and deeper share the smallest heading style
+                style = heading_styles[min(level, 3) - 1]
+                story.append(Paragraph(self._format_text(header_text), style))
                 continue
             
             # Handle bullet points
             if line.startswith(('- ', '* ')):
+                if body_lines:
+                    self._add_paragraph_to_story(story, body_lines)
+                    body_lines = []
                 list_text = line[2:].strip()
                 current_list_items.append(list_text)
                 continue
@@ -525,6 +868,9 @@ class PDFGenerationTool(Toolkit):
             # Handle tables
             if '|' in line and line.startswith('|') and line.endswith('|'):
                 if not in_table:
+                    if body_lines:
+                        self._add_paragraph_to_story(story, body_lines)
+                        body_lines = []
                     in_table = True
                     table_data = []
                 
@@ -550,9 +896,12 @@ class PDFGenerationTool(Toolkit):
                 current_list_items = []
             
             if line and not line.startswith('#'):
-                story.append(Paragraph(self._format_text(line), self.styles['IntelliBodyText']))
+                body_lines.append(line)
         
         # Handle remaining items
+        if body_lines:
+            self._add_paragraph_to_story(story, body_lines)
+        
         if current_list_items:
             self._add_list_to_story(story, current_list_items)
         
@@ -561,11 +910,25 @@ class PDFGenerationTool(Toolkit):
         
         return story
     
+    def _add_paragraph_to_story(self, story: List, lines: List[str]):
+        """Add consecutive body lines to story as a single paragraph"""
+        text = "<br/>".join(self._format_text(line) for line in lines)
+        story.append(Paragraph(text, self.styles['IntelliBodyText']))
+    
     def _add_list_to_story(self, story: List, items: List[str]):
         """Add bullet list to story"""
         for item in items:
             story.append(Paragraph(f"• {self._format_text(item)}", self.styles['IntelliBulletText']))
     
+    def _add_chart_to_story(self, story: List, symbol: str):
+        """Add a pre-rendered price chart image to story"""
+        png_bytes = self._charts.create_price_chart_png(symbol)
+        if png_bytes is None:
+            return
+        
+        story.append(Image(BytesIO(png_bytes), width=6*inch, height=3*inch))
+        story.append(Spacer(1, 12))
+    
     def _add_table_to_story(self, story: List, table_data: List[List[str]]):
         """Add table to story"""
         if not table_data:
@@ -607,89 +970,75 @@ class PDFGenerationTool(Toolkit):
             return ""
         
         # Remove any existing HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
+        text = _HTML_TAG_RE.sub('', text)
         
         # Handle bold and italic markdown
-        text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)
-        text = re.sub(r'\*([^*]+)\*', r'\1', text)
+        text = _BOLD_RE.sub(r'\1', text)
+        text = _ITALIC_RE.sub(r'\1', text)
         
         return text.strip()
     
     def _is_financial_amount(self, text: str) -> bool:
         """Check if text is a financial amount"""
-        return bool(re.match(r'^\$[0-9]+(?:\.[0-9]+)?[KMB]?$', text.strip()))
+        return bool(_AMOUNT_CELL_RE.match(text.strip()))
     
     def _is_percentage(self, text: str) -> bool:
         """Check if text is a percentage"""
-        return bool(re.match(r'^[0-9]+(?:\.[0-9]+)?%$', text.strip()))
+        return bool(_PERCENT_CELL_RE.match(text.strip()))
     
     def _is_stock_symbol(self, text: str) -> bool:
         """Check if text is a stock symbol"""
-        return bool(re.match(r'^[A-Z]{2,5}$', text.strip()))
+        return bool(_SYMBOL_CELL_RE.match(text.strip()))
     
     def _format_text(self, text: str) -> str:
         """Format text with financial styling"""
         if not text:
             return ""
         
-        # Handle bold text
-        text = re.sub(r'\*\*([^*]+)\*\*', r'<b>\1</b>', text)
-        text = re.sub(r'\*([^*]+)\*', r'<i>\1</i>', text)
-        
-        # Handle financial amounts
-        text = re.sub(
-            r'\$([0-9]+(?:\.[0-9]+)?[KMB]?)', 
-            r'<font color="#38a169" face="Courier-Bold">$\1</font>', 
-            text
-        )
-        
-        # Handle percentages
-        text = re.sub(
-            r'([0-9]+(?:\.[0-9]+)?%)', 
-            r'<font color="#3182ce" face="Courier-Bold">\1</font>', 
-            text
-        )
-        
-        # Handle stock symbols
-        text = re.sub(
-            r'\b([A-Z]{2,5})\b(?!\s*[a-z])', 
-            r'<font color="#667eea" face="Courier-Bold">\1</font>', 
-            text
-        )
-        
-        return text
+        return _format_pdf_text(text)
 
 
-class ReportGenerationTool(Toolkit):
-    """Tool for generating reports"""
-    
-    def generate_summary_report(self, analysis_data: Dict[str, Any]) -> str:
-        """Generate a summary report from analysis data"""
-        try:
-            logger.info("Generating summary report")
-            report = f"""
+# Parsed once at import; each report only substitutes its sections
+_SUMMARY_REPORT_TPL = string.Template("""
 # Investment Analysis Report
-**Generated on:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+**Generated on:** $generated_on
 
 ## Executive Summary
-{analysis_data.get('executive_summary', 'Analysis completed')}
+$executive_summary
 
 ## Financial Metrics
-{self._format_financial_data(analysis_data.get('financial_data', {}))}
+$financial
 
 ## Technical Analysis
-{self._format_technical_data(analysis_data.get('technical_data', {}))}
+$technical
 
 ## Market News & Sentiment
-{self._format_news_data(analysis_data.get('news_data', []))}
+$news
 
 ## Competitive Position
-{self._format_competitive_data(analysis_data.get('competitive_data', {}))}
+$competitive
 
 ## Recommendation
-{analysis_data.get('recommendation', 'Further analysis required')}
-"""
-            return report
+$recommendation
+""")
+
+
+class ReportGenerationTool(Toolkit):
+    """Tool for generating reports"""
+    
+    def generate_summary_report(self, analysis_data: Dict[str, Any]) -> str:
+        """Generate a summary report from analysis data"""
+        try:
+            logger.info("Generating summary report")
+            return _SUMMARY_REPORT_TPL.substitute(
+                generated_on=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                executive_summary=analysis_data.get('executive_summary', 'Analysis completed'),
+                financial=self._format_financial_data(analysis_data.get('financial_data', {})),
+                technical=self._format_technical_data(analysis_data.get('technical_data', {})),
+                news=self._format_news_data(analysis_data.get('news_data', [])),
+                competitive=self._format_competitive_data(analysis_data.get('competitive_data', {})),
+                recommendation=analysis_data.get('recommendation', 'Further analysis required')
+            )
         except Exception as e:
             logger.error(f"Report generation failed: {e}")
             return f"Report generation failed: {str(e)}"
@@ -717,9 +1066,10 @@ class ReportGenerationTool(Toolkit):
             return "Technical data unavailable"
         
         rsi = data.get('rsi', 'N/A')
-        rsi_condition = data.get('trend_analysis', {}).get('rsi_condition', 'N/A')
-        above_sma_20 = data.get('trend_analysis', {}).get('above_sma_20')
-        above_sma_50 = data.get('trend_analysis', {}).get('above_sma_50')
+        trend = data.get('trend_analysis', {})
+        rsi_condition = trend.get('rsi_condition', 'N/A')
+        above_sma_20 = trend.get('above_sma_20')
+        above_sma_50 = trend.get('above_sma_50')
         
         return f"""
 - **RSI:** {rsi} ({rsi_condition})
@@ -731,10 +1081,12 @@ class ReportGenerationTool(Toolkit):
         if not data:
             return "No recent news available"
         
-        news_summary = ""
-        for item in data[:3]:
-            if "error" not in item:
-                news_summary += f"- **{item.get('title', 'N/A')}** ({item.get('source', 'Unknown')})\n"
+        # Lines are collected and joined once rather than concatenated one by one
+        news_summary = "".join(
+            f"- **{item.get('title', 'N/A')}** ({item.get('source', 'Unknown')})\n"
+            for item in data[:3]
+            if "error" not in item
+        )
         
         return news_summary or "No recent news available"
     
@@ -746,10 +1098,7 @@ class ReportGenerationTool(Toolkit):
         if not comparison:
             return "No comparison data available"
         
-        comp_summary = ""
-        for symbol, metrics in comparison.items():
-            current_price = metrics.get('current_price', 'N/A')
-            price_change_pct = metrics.get('price_change_pct', 0)
-            comp_summary += f"- **{symbol}:** ${current_price} ({price_change_pct:.2f}%)\n"
-        
-        return comp_summary.strip()
\ No newline at end of file
+        return "\n".join(
+            f"- **{symbol}:** ${metrics.get('current_price', 'N/A')} ({metrics.get('price_change_pct', 0):.2f}%)"
+            for symbol, metrics in comparison.items()
+        )
\ No newline at end of file
@@ -1,9 +1,12 @@
-from typing import Dict, List, Any
-from agents import AgentFactory
+from typing import Dict, Iterator, List, Any, Tuple
+from agents import AgentFactory, AgentOrchestrator
 from datetime import datetime
+import asyncio
 import json
 import logging
+import queue
 import re
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -14,59 +17,26 @@ class InvestmentAnalysisWorkflow:
     def __init__(self):
         logger.info("Initializing Investment Analysis Workflow")
         self.agents = AgentFactory.create_all_agents()
-        self.results = {}
+        self.orchestrator = AgentOrchestrator(self.agents)
     
-    def analyze_stock(self, symbol: str) -> Dict[str, Any]:
-        """Complete stock analysis workflow"""
+    def analyze_stock(self, symbol: str, defer_report: bool = False) -> Dict[str, Any]:
+        """Complete stock analysis workflow, optionally queueing the final report"""
         
         logger.info(f"Starting comprehensive analysis for {symbol}")
         
-        # Step 1: Financial Analysis
-        logger.info("Performing financial analysis")
-        financial_analysis = self.agents["financial"].analyze_stock(symbol)
-        
-        # Check for $1 in financial analysis and replace if needed
-        if isinstance(financial_analysis, str) and "$1" in financial_analysis:
-            debug_data = self.agents["financial"].debug_tool_data(symbol)
-            current_price = debug_data.get('current_price')
-            if current_price:
-                financial_analysis = financial_analysis.replace("$1", f"${current_price}")
-        
-        self.results["financial"] = financial_analysis
-        
-        # Step 2: Technical Analysis  
-        logger.info("Performing technical analysis")
-        technical_analysis = self.agents["technical"].technical_analysis(symbol)
-        self.results["technical"] = technical_analysis
-        
-        # Step 3: News Research
-        logger.info("Researching company news")
-        news_analysis = self.agents["research"].research_company_news(symbol)
-        self.results["news"] = news_analysis
-        
-        # Step 4: Competitive Analysis
-        logger.info("Analyzing competitive landscape")
-        competitive_analysis = self.agents["competitive"].analyze_competitive_landscape(symbol)
-        self.results["competitive"] = competitive_analysis
-        
-        # Step 5: Generate Final Report
-        logger.info("Generating comprehensive report")
-        final_report = self.agents["report"].generate_investment_report(
-            symbol, 
-            {
-                "financial_analysis": financial_analysis,
-                "technical_analysis": technical_analysis,
-                "news_analysis": news_analysis,
-                "competitive_analysis": competitive_analysis,
-                "timestamp": datetime.now().isoformat()
-            }
-        )
+        # Financial, technical, news and competitive analyses are independent,
+        # so the orchestrator runs them concurrently before the final report
+        analysis = asyncio.run(self.orchestrator.analyze_symbol_async(symbol, defer_report))
         
-        self.results["final_report"] = final_report
+        financial_analysis = analysis["financial_analysis"]
+        technical_analysis = analysis["technical_analysis"]
+        news_analysis = analysis["news_analysis"]
+        competitive_analysis = analysis["competitive_analysis"]
+        final_report = analysis["final_report"]
         
         logger.info("Analysis complete")
         
-        return {
+        result = {
             "symbol": symbol,
             "timestamp": datetime.now().isoformat(),
             "financial_analysis": financial_analysis,
@@ -75,23 +45,51 @@ class InvestmentAnalysisWorkflow:
             "competitive_analysis": competitive_analysis,
             "final_report": final_report
         }
+        if defer_report:
+            result["report_job_id"] = analysis["report_job_id"]
+        
+        return result
+    
+    def stream_analysis(self, symbol: str) -> Iterator[Tuple[str, str]]:
+        """Yield (section, chunk) pairs as the comprehensive analysis is generated"""
+        logger.info(f"Streaming comprehensive analysis for {symbol}")
+        
+        chunks = queue.Queue()
+        done = object()
+        
+        async def consume():
+            async for item in self.orchestrator.stream_symbol_async(symbol):
+                chunks.put(item)
+        
+        def run():
+            # The orchestrator streams on its own event loop; chunks cross back through the queue
+            try:
+                asyncio.run(consume())
+            except Exception as e:
+                chunks.put(e)
+            finally:
+                chunks.put(done)
+        
+        threading.Thread(target=run, name=f"stream-{symbol}", daemon=True).start()
+        while True:
+            item = chunks.get()
+            if item is done:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+        
+        logger.info("Streaming analysis complete")
     
     def quick_analysis(self, symbol: str) -> str:
         """Quick analysis for faster results"""
         logger.info(f"Quick analysis for {symbol}")
         
-        # Get tool data before analysis
-        debug_data = self.agents["financial"].debug_tool_data(symbol)
-        current_price = debug_data.get('current_price')
-        
-        # Just financial and technical analysis
+        # Just financial and technical analysis; both agents fetch the real
+        # price themselves and replace any $1 placeholders with it
         financial = self.agents["financial"].analyze_stock(symbol)
         technical = self.agents["technical"].technical_analysis(symbol)
         
-        # Check for $1 in analysis results and replace if needed
-        if isinstance(financial, str) and "$1" in financial and current_price:
-            financial = financial.replace("$1", f"${current_price}")
-        
         # Generate quick report
         report = self.agents["report"].generate_investment_report(
             symbol,
@@ -103,10 +101,6 @@ class InvestmentAnalysisWorkflow:
             }
         )
         
-        # Final safety check: replace any remaining $1 with real price
-        if isinstance(report, str) and "$1" in report and current_price:
-            report = report.replace("$1", f"${current_price}")
-        
         logger.info("Quick analysis complete")
         return report
 
@@ -117,30 +111,19 @@ class ComparisonWorkflow:
     def __init__(self):
         logger.info("Initializing Comparison Workflow")
         self.agents = AgentFactory.create_all_agents()
+        self.orchestrator = AgentOrchestrator(self.agents)
     
     def compare_stocks(self, symbols: List[str]) -> Dict[str, Any]:
         """Compare multiple stocks across different dimensions"""
         
         logger.info(f"Comparing stocks: {', '.join(symbols)}")
         
-        results = {}
-        
-        # Financial Comparison
-        logger.info("Financial comparison")
-        financial_comparison = self.agents["financial"].compare_stocks(symbols)
-        results["financial_comparison"] = financial_comparison
-        
-        # Technical Comparison
-        logger.info("Technical comparison")
-        technical_comparison = self.agents["technical"].chart_analysis(symbols)
-        results["technical_comparison"] = technical_comparison
-        
-        # Competitive Analysis for each stock
-        logger.info("Competitive analysis")
-        competitive_analyses = {}
-        for symbol in symbols:
-            competitive_analyses[symbol] = self.agents["competitive"].analyze_competitive_landscape(symbol)
-        results["competitive_analyses"] = competitive_analyses
+        # Financial, technical and per-symbol competitive analyses are independent,
+        # so the orchestrator runs them concurrently before the report
+        results = asyncio.run(self.orchestrator.compare_symbols_async(symbols))
+        financial_comparison = results["financial_comparison"]
+        technical_comparison = results["technical_comparison"]
+        competitive_analyses = results["competitive_analyses"]
         
         # Generate comparison report
         logger.info("Generating comparison report")
@@ -182,9 +165,7 @@ class MarketResearchWorkflow:
         potential_symbols = self._extract_symbols(topic)
         if potential_symbols:
             logger.info(f"Found potential stocks: {potential_symbols}")
-            financial_context = {}
-            for symbol in potential_symbols[:3]:
-                financial_context[symbol] = self.agents["financial"].analyze_stock(symbol)
+            financial_context = self.agents["financial"].analyze_stocks_batched(potential_symbols[:3])
             results["financial_context"] = financial_context
         
         # Generate research report
@@ -242,8 +223,8 @@ class CustomQueryWorkflow:
             logger.info("Using Financial Agent")
             symbols = self._extract_symbols_from_query(query)
             if symbols:
-                for symbol in symbols[:2]:
-                    result = self.agents["financial"].analyze_stock(symbol)
+                batched = self.agents["financial"].analyze_stocks_batched(symbols[:2])
+                for symbol, result in batched.items():
                     results.append(f"Financial Analysis for {symbol}:\n{result}")
         
         # Technical analysis needed?
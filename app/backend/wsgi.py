@@ -0,0 +1,7 @@
+# WSGI entry point for production: gunicorn -c backend/gunicorn.conf.py wsgi:application
+
+from app import create_app
+
+# No threads may be running when the master forks, so gunicorn.conf.py starts the
+# background tasks in each worker instead
+application = create_app(background_tasks=False)